@@ -5,7 +5,6 @@ import asyncio
 import copy
 import logging
 import os
-import re
 import signal
 import sys
 import lavalink
@@ -34,20 +33,28 @@ except ImportError:
     pass
 
 from core import checks
+from core.blocklist import BlockList
+from core.categories import CategoryPool, ChannelPool
 from core.changelog import Changelog
 from core.clients import ApiClient, MongoDBClient, PluginDatabaseClient
+from core.closures import ClosureScheduler
 from core.config import ConfigManager
+from core.dispatch import DispatchTable, MessageContext
+from core.embeds import EmbedTemplates
 from core.models import (
     DMDisabled,
     HostingMethod,
     InvalidConfigError,
     PermissionLevel,
     SafeFormatter,
+    Default,
     configure_logging,
     getLogger,
 )
+from core.outbound import OutboundQueue
 from core.thread import ThreadManager
 from core.time import human_timedelta
+from core.triggers import TriggerIndex
 from core.utils import normalize_alias, truncate
 
 logger = getLogger(__name__)
@@ -78,6 +85,8 @@ class ModmailBot(commands.Bot):
             self.loaded_cogs = json.load(fp)["loaded_cogs"]
 
         self._connected = asyncio.Event()
+        self._emoji_cache = {}
+        self._prefixes = None
         self.start_time = datetime.utcnow()
         self.lavalink: typing.Optional[lavalink.Client] = None
 
@@ -85,6 +94,15 @@ class ModmailBot(commands.Bot):
         self.config.populate_cache()
 
         self.threads = ThreadManager(self)
+        self.blocklist = BlockList(self)
+        self.trigger_index = TriggerIndex(self)
+        self.dispatch_table = DispatchTable(self)
+        self.permission_resolver = checks.PermissionResolver(self)
+        self.closure_scheduler = ClosureScheduler(self)
+        self.outbound = OutboundQueue(self)
+        self.embed_templates = EmbedTemplates(self)
+        self.category_pool = CategoryPool(self)
+        self.channel_pool = ChannelPool(self)
 
         self.log_file_name = os.path.join(temp_dir, f"{self.token.split('.')[0]}.log")
         self._configure_logging()
@@ -194,7 +212,20 @@ class ModmailBot(commands.Bot):
         return self.api.db
 
     async def get_prefix(self, message=None):
-        return [self.prefix, f"<@{self.user.id}> ", f"<@!{self.user.id}> "]
+        key = (self.prefix, self.user.id)
+        if self._prefixes is None or self._prefixes[0] != key:
+            prefix, user_id = key
+            self._prefixes = key, [prefix, f"<@{user_id}> ", f"<@!{user_id}> "]
+        return self._prefixes[1]
+
+    async def close(self):
+        if self._api is not None:
+            await self.closure_scheduler.close()
+            try:
+                await self._api.flush_logs()
+            except Exception:
+                logger.error("Failed to write buffered log messages.", exc_info=True)
+        await super().close()
 
     def run(self):
         loop = self.loop
@@ -311,7 +342,7 @@ class ModmailBot(commands.Bot):
         return owner_ids
 
     async def is_owner(self, user: discord.User) -> bool:
-        if user.id in self.bot_owner_ids:
+        if user.id == self.owner_id or self.permission_resolver.is_owner_id(user.id):
             return True
         return await super().is_owner(user)
 
@@ -488,19 +519,19 @@ class ModmailBot(commands.Bot):
 
     @property
     def mod_color(self) -> int:
-        return self.config.get("mod_color")
+        return self.config.get_color("mod_color")
 
     @property
     def recipient_color(self) -> int:
-        return self.config.get("recipient_color")
+        return self.config.get_color("recipient_color")
 
     @property
     def main_color(self) -> int:
-        return self.config.get("main_color")
+        return self.config.get_color("main_color")
 
     @property
     def error_color(self) -> int:
-        return self.config.get("error_color")
+        return self.config.get_color("error_color")
 
     def command_perm(self, command_name: str) -> PermissionLevel:
         level = self.config["override_command_level"].get(command_name)
@@ -570,73 +601,11 @@ class ModmailBot(commands.Bot):
 
         await self.threads.populate_cache()
 
-        # closures
-        closures = self.config["closures"]
-        logger.info("There are %d thread(s) pending to be closed.", len(closures))
-        logger.line()
-
-        for recipient_id, items in tuple(closures.items()):
-            after = (
-                datetime.fromisoformat(items["time"]) - datetime.utcnow()
-            ).total_seconds()
-            if after <= 0:
-                logger.debug("Closing thread for recipient %s.", recipient_id)
-                after = 0
-            else:
-                logger.debug(
-                    "Thread for recipient %s will be closed after %s seconds.",
-                    recipient_id,
-                    after,
-                )
-
-            thread = await self.threads.find(recipient_id=int(recipient_id))
-
-            if not thread:
-                # If the channel is deleted
-                logger.debug("Failed to close thread for recipient %s.", recipient_id)
-                self.config["closures"].pop(recipient_id)
-                await self.config.update()
-                continue
-
-            await thread.close(
-                closer=self.get_user(items["closer_id"]),
-                after=after,
-                silent=items["silent"],
-                delete_channel=items["delete_channel"],
-                message=items["message"],
-                auto_close=items.get("auto_close", False),
-            )
-
-        for log in await self.api.get_open_logs():
-            if self.get_channel(int(log["channel_id"])) is None:
-                logger.debug(
-                    "Unable to resolve thread with channel %s.", log["channel_id"]
-                )
-                log_data = await self.api.post_log(
-                    log["channel_id"],
-                    {
-                        "open": False,
-                        "title": None,
-                        "closed_at": str(datetime.utcnow()),
-                        "close_message": "Channel has been deleted, no closer found.",
-                        "closer": {
-                            "id": str(self.user.id),
-                            "name": self.user.name,
-                            "discriminator": self.user.discriminator,
-                            "avatar_url": str(self.user.avatar_url),
-                            "mod": True,
-                        },
-                    },
-                )
-                if log_data:
-                    logger.debug(
-                        "Successfully closed thread with channel %s.", log["channel_id"]
-                    )
-                else:
-                    logger.debug(
-                        "Failed to close thread with channel %s, skipping.",
-                        log["channel_id"],
-                    )
+        # restore the scheduled closes and close the logs of deleted channels
+        await asyncio.gather(
+            self.closure_scheduler.recover(), self._close_orphaned_logs()
+        )
+        self.channel_pool.start()
 
         if self.config.get("data_collection"):
             self.metadata_loop = tasks.Loop(
@@ -678,17 +647,59 @@ class ModmailBot(commands.Bot):
                 "If the external servers are valid, you may ignore this message."
             )
 
+    async def _close_orphaned_logs(self) -> None:
+        logs = await self.api.get_open_logs(projection={"channel_id": True})
+        orphans = [
+            log["channel_id"]
+            for log in logs
+            if self.get_channel(int(log["channel_id"])) is None
+        ]
+        if not orphans:
+            return
+
+        logger.debug("Unable to resolve threads with channels %s.", ", ".join(orphans))
+        closed = await self.api.close_logs(
+            orphans,
+            {
+                "open": False,
+                "title": None,
+                "closed_at": str(datetime.utcnow()),
+                "close_message": "Channel has been deleted, no closer found.",
+                "closer": {
+                    "id": str(self.user.id),
+                    "name": self.user.name,
+                    "discriminator": self.user.discriminator,
+                    "avatar_url": str(self.user.avatar_url),
+                    "mod": True,
+                },
+            },
+        )
+        logger.debug("Closed %d of %d orphaned thread(s).", closed, len(orphans))
+
+    def clear_emoji_cache(self) -> None:
+        self._emoji_cache.clear()
+
     async def convert_emoji(self, name: str) -> str:
+        try:
+            return self._emoji_cache[name]
+        except KeyError:
+            pass
+
         ctx = SimpleNamespace(bot=self, guild=self.modmail_guild)
         converter = commands.EmojiConverter()
 
+        emoji = name
         if name not in UNICODE_EMOJI:
             try:
-                name = await converter.convert(ctx, name.strip(":"))
+                emoji = await converter.convert(ctx, name.strip(":"))
             except commands.BadArgument as e:
-                logger.warning("%s is not a valid emoji. %s.", e)
+                logger.warning("%s is not a valid emoji. %s.", name, e)
                 raise
-        return name
+
+        if len(self._emoji_cache) >= 128:
+            self.clear_emoji_cache()
+        self._emoji_cache[name] = emoji
+        return emoji
 
     async def retrieve_emoji(self) -> typing.Tuple[str, str]:
 
@@ -766,70 +777,18 @@ class ModmailBot(commands.Bot):
         return True
 
     def check_manual_blocked_roles(self, author: discord.Member) -> bool:
-        if isinstance(author, discord.Member):
-            for r in author.roles:
-                if str(r.id) in self.blocked_roles:
-
-                    blocked_reason = self.blocked_roles.get(str(r.id)) or ""
-                    now = datetime.utcnow()
-
-                    # etc "blah blah blah... until 2019-10-14T21:12:45.559948."
-                    end_time = re.search(r"until ([^`]+?)\.$", blocked_reason)
-                    if end_time is None:
-                        # backwards compat
-                        end_time = re.search(r"%([^%]+?)%", blocked_reason)
-                        if end_time is not None:
-                            logger.warning(
-                                r"Deprecated time message for role %s, block and unblock again to update.",
-                                r.name,
-                            )
-
-                    if end_time is not None:
-                        after = (
-                            datetime.fromisoformat(end_time.group(1)) - now
-                        ).total_seconds()
-                        if after <= 0:
-                            # No longer blocked
-                            self.blocked_roles.pop(str(r.id))
-                            logger.debug("No longer blocked, role %s.", r.name)
-                            return True
-                    logger.debug("User blocked, role %s.", r.name)
-                    return False
-
+        if isinstance(author, discord.Member) and self.blocklist.is_role_blocked(
+            author
+        ):
+            logger.debug("User blocked, roles of %s.", author.name)
+            return False
         return True
 
     def check_manual_blocked(self, author: discord.Member) -> bool:
-        if str(author.id) not in self.blocked_users:
-            return True
-
-        blocked_reason = self.blocked_users.get(str(author.id)) or ""
-        now = datetime.utcnow()
-
-        if blocked_reason.startswith("System Message:"):
-            # Met the limits already, otherwise it would've been caught by the previous checks
-            logger.debug("No longer internally blocked, user %s.", author.name)
-            self.blocked_users.pop(str(author.id))
-            return True
-        # etc "blah blah blah... until 2019-10-14T21:12:45.559948."
-        end_time = re.search(r"until ([^`]+?)\.$", blocked_reason)
-        if end_time is None:
-            # backwards compat
-            end_time = re.search(r"%([^%]+?)%", blocked_reason)
-            if end_time is not None:
-                logger.warning(
-                    r"Deprecated time message for user %s, block and unblock again to update.",
-                    author.name,
-                )
-
-        if end_time is not None:
-            after = (datetime.fromisoformat(end_time.group(1)) - now).total_seconds()
-            if after <= 0:
-                # No longer blocked
-                self.blocked_users.pop(str(author.id))
-                logger.debug("No longer blocked, user %s.", author.name)
-                return True
-        logger.debug("User blocked, user %s.", author.name)
-        return False
+        if self.blocklist.is_user_blocked(author.id):
+            logger.debug("User blocked, user %s.", author.name)
+            return False
+        return True
 
     async def _process_blocked(self, message):
         _, blocked_emoji = await self.retrieve_emoji()
@@ -850,11 +809,10 @@ class ModmailBot(commands.Bot):
 
         member = self.guild.get_member(author.id)
         if member is None:
-            # try to find in other guilds
-            for g in self.guilds:
-                member = g.get_member(author.id)
-                if member:
-                    break
+            # the modmail guild of a multiple server setup
+            modmail_guild = self.modmail_guild
+            if modmail_guild is not None and modmail_guild != self.guild:
+                member = modmail_guild.get_member(author.id)
 
             if member is None:
                 logger.debug("User not in guild, %s.", author.id)
@@ -862,9 +820,10 @@ class ModmailBot(commands.Bot):
         if member is not None:
             author = member
 
-        if str(author.id) in self.blocked_whitelisted_users:
+        if self.blocklist.is_whitelisted(author.id):
             if str(author.id) in self.blocked_users:
                 self.blocked_users.pop(str(author.id))
+                self.blocklist.invalidate()
                 await self.config.update()
             return False
 
@@ -873,6 +832,7 @@ class ModmailBot(commands.Bot):
         if not self.check_account_age(author) or not self.check_guild_age(author):
             new_reason = self.blocked_users.get(str(author.id))
             if new_reason != blocked_reason:
+                self.blocklist.invalidate()
                 if send_message:
                     await channel.send(
                         embed=discord.Embed(
@@ -883,14 +843,15 @@ class ModmailBot(commands.Bot):
                     )
             return True
 
-        if not self.check_manual_blocked(author):
-            return True
+        blocked = not self.check_manual_blocked(
+            author
+        ) or not self.check_manual_blocked_roles(author)
 
-        if not self.check_manual_blocked_roles(author):
-            return True
-
-        await self.config.update()
-        return False
+        if self.blocklist.changed:
+            # expired blocks were removed
+            self.blocklist.changed = False
+            await self.config.update()
+        return blocked
 
     async def get_thread_cooldown(self, author: discord.Member):
         thread_cooldown = self.config.get("thread_cooldown")
@@ -965,15 +926,7 @@ class ModmailBot(commands.Bot):
                 DMDisabled.NEW_THREADS,
                 DMDisabled.ALL_THREADS,
             ):
-                embed = discord.Embed(
-                    title=self.config["disabled_new_thread_title"],
-                    color=self.error_color,
-                    description=self.config["disabled_new_thread_response"],
-                )
-                embed.set_footer(
-                    text=self.config["disabled_new_thread_footer"],
-                    icon_url=self.guild.icon_url,
-                )
+                embed = self.embed_templates.get("disabled_new_thread")
                 logger.info(
                     "A new thread was blocked from %s due to disabled Modmail.",
                     message.author,
@@ -984,15 +937,7 @@ class ModmailBot(commands.Bot):
             thread = await self.threads.create(message.author, message=message)
         else:
             if self.config["dm_disabled"] == DMDisabled.ALL_THREADS:
-                embed = discord.Embed(
-                    title=self.config["disabled_current_thread_title"],
-                    color=self.error_color,
-                    description=self.config["disabled_current_thread_response"],
-                )
-                embed.set_footer(
-                    text=self.config["disabled_current_thread_footer"],
-                    icon_url=self.guild.icon_url,
-                )
+                embed = self.embed_templates.get("disabled_current_thread")
                 logger.info(
                     "A message was blocked from %s due to disabled Modmail.",
                     message.author,
@@ -1010,100 +955,108 @@ class ModmailBot(commands.Bot):
                 await self.add_reaction(message, sent_emoji)
                 self.dispatch("thread_reply", thread, False, message, False, False)
 
-    async def get_contexts(self, message, *, cls=commands.Context):
+    async def resolve_message(self, message, *, thread=Default) -> MessageContext:
+        """
+        Resolves the prefix, the invoked name and the thread of a message.
+
+        Parameters
+        ----------
+        message : discord.Message
+            The message.
+        thread : Optional[Thread]
+            The thread of the channel, if it was already found.
+
+        Returns
+        -------
+        MessageContext
+            The resolved message, shared by the handlers of the message.
+        """
+        resolved = MessageContext(message, thread=thread)
+        if resolved.thread is Default:
+            resolved.thread = await self.threads.find(channel=message.channel)
+
+        if not self._skip_check(message.author.id, self.user.id):
+            resolved.parse(await self.get_prefix())
+        return resolved
+
+    def _alias_contexts(self, resolved, prefix, aliases, *, cls=commands.Context):
+        ctxs = []
+        for alias in aliases:
+            view = StringView(prefix + alias)
+            ctx = cls(
+                prefix=self.prefix, view=view, bot=self, message=resolved.message
+            )
+            ctx.thread = resolved.thread
+            view.skip_string(prefix)
+            ctx.invoked_with = view.get_word().lower()
+            ctx.command = self.all_commands.get(ctx.invoked_with)
+            ctxs.append(ctx)
+        return ctxs
+
+    async def get_contexts(
+        self, message, *, cls=commands.Context, resolved: MessageContext = None
+    ):
         """
         Returns all invocation contexts from the message.
         Supports getting the prefix from database as well as command aliases.
+        The contexts are built once per resolved message.
         """
+        if resolved is None:
+            resolved = await self.resolve_message(message)
+        if resolved.ctxs is not None:
+            return resolved.ctxs
 
-        view = StringView(message.content)
-        ctx = cls(prefix=self.prefix, view=view, bot=self, message=message)
-        thread = await self.threads.find(channel=ctx.channel)
+        ctx = cls(prefix=self.prefix, view=resolved.view, bot=self, message=message)
+        if resolved.invoker is None:
+            resolved.ctxs = [ctx]
+            return resolved.ctxs
 
-        if self._skip_check(message.author.id, self.user.id):
-            return [ctx]
-
-        prefixes = await self.get_prefix()
+        # Check if there is any aliases being called.
+        aliases = self.dispatch_table.get_alias(resolved.invoker, resolved.arguments)
+        if aliases is not None:
+            if not aliases:
+                logger.warning("Alias %s is invalid, removing.", resolved.invoker)
+                self.aliases.pop(resolved.invoker)
+                self.dispatch_table.invalidate()
 
-        invoked_prefix = discord.utils.find(view.skip_string, prefixes)
-        if invoked_prefix is None:
-            return [ctx]
+            resolved.ctxs = self._alias_contexts(
+                resolved, resolved.prefix, aliases, cls=cls
+            )
+            return resolved.ctxs
 
-        invoker = view.get_word().lower()
+        ctx.thread = resolved.thread
+        ctx.invoked_with = resolved.invoker
+        ctx.command = self.all_commands.get(resolved.invoker)
+        resolved.ctxs = [ctx]
+        return resolved.ctxs
 
-        # Check if there is any aliases being called.
-        alias = self.aliases.get(invoker)
-        if alias is not None:
-            ctxs = []
-            aliases = normalize_alias(
-                alias, message.content[len(f"{invoked_prefix}{invoker}") :]
-            )
-            if not aliases:
-                logger.warning("Alias %s is invalid, removing.", invoker)
-                self.aliases.pop(invoker)
-
-            for alias in aliases:
-                view = StringView(invoked_prefix + alias)
-                ctx_ = cls(prefix=self.prefix, view=view, bot=self, message=message)
-                ctx_.thread = thread
-                discord.utils.find(view.skip_string, prefixes)
-                ctx_.invoked_with = view.get_word().lower()
-                ctx_.command = self.all_commands.get(ctx_.invoked_with)
-                ctxs += [ctx_]
-            return ctxs
-
-        ctx.thread = thread
-        ctx.invoked_with = invoker
-        ctx.command = self.all_commands.get(invoker)
-        return [ctx]
-
-    async def trigger_auto_triggers(self, message, channel, *, cls=commands.Context):
+    async def trigger_auto_triggers(
+        self, message, channel, *, cls=commands.Context, thread=Default
+    ):
         message.author = self.modmail_guild.me
         message.channel = channel
         message.guild = channel.guild
 
-        view = StringView(message.content)
-        ctx = cls(prefix=self.prefix, view=view, bot=self, message=message)
-        thread = await self.threads.find(channel=ctx.channel)
-
-        invoked_prefix = self.prefix
-        invoker = None
+        found = self.trigger_index.match(
+            message.content, regex=self.config.get("use_regex_autotrigger")
+        )
+        if found is None:
+            return
+        trigger, invoker = found
 
-        if self.config.get("use_regex_autotrigger"):
-            trigger = next(
-                filter(
-                    lambda x: re.search(x, message.content), self.auto_triggers.keys()
-                )
-            )
-            if trigger:
-                invoker = re.search(trigger, message.content).group(0)
-        else:
-            trigger = next(
-                filter(
-                    lambda x: x.lower() in message.content.lower(),
-                    self.auto_triggers.keys(),
-                )
-            )
-            if trigger:
-                invoker = trigger.lower()
+        resolved = MessageContext(message, thread=thread)
+        if resolved.thread is Default:
+            resolved.thread = await self.threads.find(channel=channel)
 
         alias = self.auto_triggers[trigger]
 
         ctxs = []
         if alias is not None:
-            ctxs = []
             aliases = normalize_alias(alias)
             if not aliases:
                 logger.warning("Alias %s is invalid as called in autotrigger.", invoker)
-
-            for alias in aliases:
-                view = StringView(invoked_prefix + alias)
-                ctx_ = cls(prefix=self.prefix, view=view, bot=self, message=message)
-                ctx_.thread = thread
-                discord.utils.find(view.skip_string, await self.get_prefix())
-                ctx_.invoked_with = view.get_word().lower()
-                ctx_.command = self.all_commands.get(ctx_.invoked_with)
-                ctxs += [ctx_]
+            ctxs = self._alias_contexts(resolved, self.prefix, aliases, cls=cls)
+        resolved.ctxs = ctxs
 
         for ctx in ctxs:
             if ctx.command:
@@ -1120,26 +1073,12 @@ class ModmailBot(commands.Bot):
         Returns the invocation context from the message.
         Supports getting the prefix from database.
         """
-
-        view = StringView(message.content)
-        ctx = cls(prefix=self.prefix, view=view, bot=self, message=message)
-
-        if self._skip_check(message.author.id, self.user.id):
-            return ctx
-
-        ctx.thread = await self.threads.find(channel=ctx.channel)
-
-        prefixes = await self.get_prefix()
-
-        invoked_prefix = discord.utils.find(view.skip_string, prefixes)
-        if invoked_prefix is None:
-            return ctx
-
-        invoker = view.get_word().lower()
-
-        ctx.invoked_with = invoker
-        ctx.command = self.all_commands.get(invoker)
-
+        resolved = await self.resolve_message(message)
+        ctx = cls(prefix=self.prefix, view=resolved.view, bot=self, message=message)
+        ctx.thread = resolved.thread
+        if resolved.invoker is not None:
+            ctx.invoked_with = resolved.invoker
+            ctx.command = self.all_commands.get(resolved.invoker)
         return ctx
 
     async def update_perms(
@@ -1170,6 +1109,7 @@ class ModmailBot(commands.Bot):
         else:
             self.config["command_permissions"] = permissions
         logger.info("Updating permissions for %s, %s (add=%s).", name, value, add)
+        self.permission_resolver.invalidate()
         await self.config.update()
 
     async def on_message(self, message):
@@ -1208,18 +1148,21 @@ class ModmailBot(commands.Bot):
         if isinstance(message.channel, discord.DMChannel):
             return await self.process_dm_modmail(message)
 
-        if message.content.startswith(self.prefix):
-            cmd = message.content[len(self.prefix) :].strip()
+        prefix = self.prefix
+        if message.content.startswith(prefix):
+            cmd = message.content[len(prefix) :].strip()
 
             # Process snippets
-            if cmd in self.snippets:
-                snippet = self.snippets[cmd]
+            snippet = self.dispatch_table.get_snippet(cmd)
+            if snippet is not None:
                 if self.config["anonymous_snippets"]:
-                    message.content = f"{self.prefix}fareply {snippet}"
+                    message.content = f"{prefix}fareply {snippet}"
                 else:
-                    message.content = f"{self.prefix}freply {snippet}"
+                    message.content = f"{prefix}freply {snippet}"
 
-        ctxs = await self.get_contexts(message)
+        # every context of the message belongs to the same thread
+        resolved = await self.resolve_message(message)
+        ctxs = await self.get_contexts(message, resolved=resolved)
         for ctx in ctxs:
             if ctx.command:
                 if not any(
@@ -1234,9 +1177,13 @@ class ModmailBot(commands.Bot):
                     checks.has_permissions(PermissionLevel.INVALID)(ctx.command)
 
                 await self.invoke(ctx)
+                # the command may have closed the thread
+                resolved.thread = Default
                 continue
 
-            thread = await self.threads.find(channel=ctx.channel)
+            if resolved.thread is Default:
+                resolved.thread = await self.threads.find(channel=ctx.channel)
+            thread = resolved.thread
             if thread is not None:
                 anonymous = False
                 plain = False
@@ -1272,16 +1219,14 @@ class ModmailBot(commands.Bot):
             thread = await self.threads.find(recipient=user)
 
             if thread:
-                await thread.channel.trigger_typing()
+                await thread.relay_typing(from_recipient=True)
         else:
             if not self.config.get("mod_typing"):
                 return
 
             thread = await self.threads.find(channel=channel)
             if thread is not None and thread.recipient:
-                if await self.is_blocked(thread.recipient):
-                    return
-                await thread.recipient.trigger_typing()
+                await thread.relay_typing(from_recipient=False)
 
     async def handle_reaction_events(self, payload):
         user = self.get_user(payload.user_id)
@@ -1385,15 +1330,7 @@ class ModmailBot(commands.Bot):
                             DMDisabled.NEW_THREADS,
                             DMDisabled.ALL_THREADS,
                         ):
-                            embed = discord.Embed(
-                                title=self.config["disabled_new_thread_title"],
-                                color=self.error_color,
-                                description=self.config["disabled_new_thread_response"],
-                            )
-                            embed.set_footer(
-                                text=self.config["disabled_new_thread_footer"],
-                                icon_url=self.guild.icon_url,
-                            )
+                            embed = self.embed_templates.get("disabled_new_thread")
                             logger.info(
                                 "A new thread using react to contact was blocked from %s due to disabled Modmail.",
                                 member,
@@ -1412,10 +1349,36 @@ class ModmailBot(commands.Bot):
         if self.config["transfer_reactions"]:
             await self.handle_reaction_events(payload)
 
+    async def on_guild_emojis_update(self, guild, before, after):
+        if guild == self.modmail_guild:
+            # custom emojis may have been renamed or deleted
+            self.clear_emoji_cache()
+
+    async def on_guild_channel_create(self, channel):
+        if channel.guild != self.modmail_guild:
+            return
+
+        self.category_pool.channel_created(channel)
+        if isinstance(channel, discord.TextChannel):
+            self.threads.index_channel(channel)
+
+    async def on_guild_channel_update(self, before, after):
+        if after.guild != self.modmail_guild:
+            return
+
+        self.category_pool.channel_updated(before, after)
+        if isinstance(after, discord.TextChannel) and before.topic != after.topic:
+            self.threads.index_channel(after)
+
     async def on_guild_channel_delete(self, channel):
         if channel.guild != self.modmail_guild:
             return
 
+        self.category_pool.channel_deleted(channel)
+        self.channel_pool.channel_deleted(channel)
+        if isinstance(channel, discord.TextChannel):
+            self.threads.unindex_channel(channel)
+
         if isinstance(channel, discord.CategoryChannel):
             if self.main_category == channel:
                 logger.debug("Main category was deleted.")
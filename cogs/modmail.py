@@ -253,6 +253,7 @@ class Modmail(commands.Cog):
             return await ctx.send(embed=embed)
 
         self.bot.snippets[name] = value
+        self.bot.dispatch_table.invalidate()
         await self.bot.config.update()
 
         embed = discord.Embed(
@@ -274,6 +275,7 @@ class Modmail(commands.Cog):
                 description=f"Snippet `{name}` is now deleted.",
             )
             self.bot.snippets.pop(name)
+            self.bot.dispatch_table.invalidate()
             await self.bot.config.update()
         else:
             embed = create_not_found_embed(name, self.bot.snippets.keys(), "Snippet")
@@ -291,6 +293,7 @@ class Modmail(commands.Cog):
         """
         if name in self.bot.snippets:
             self.bot.snippets[name] = value
+            self.bot.dispatch_table.invalidate()
             await self.bot.config.update()
 
             embed = discord.Embed(
@@ -344,6 +347,7 @@ class Modmail(commands.Cog):
             silent_words = ["silent", "silently"]
             silent = any(word in silent_words for word in options.split())
 
+        self.bot.threads.count_request("move", "edit_channel")
         await thread.channel.edit(category=category, sync_permissions=True)
 
         if self.bot.config["thread_move_notify"] and not silent:
@@ -799,6 +803,34 @@ class Modmail(commands.Cog):
 
         await ctx.send(embed=embed)
 
+    @logs.command(name="migrate")
+    @checks.has_permissions(PermissionLevel.OWNER)
+    async def logs_migrate(self, ctx):
+        """
+        Move the messages of the open logs into the separate messages collection.
+
+        Closed logs get their messages back in the log document.
+
+        Only used when `separate_log_messages` is enabled.
+        """
+        if not self.bot.config["separate_log_messages"]:
+            embed = discord.Embed(
+                title="Error",
+                description="`separate_log_messages` is not enabled.",
+                color=self.bot.error_color,
+            )
+            return await ctx.send(embed=embed)
+
+        async with ctx.typing():
+            count = await self.bot.api.migrate_log_messages()
+
+        embed = discord.Embed(
+            title="Success",
+            description=f"Migrated the messages of {count} log entries.",
+            color=self.bot.main_color,
+        )
+        await ctx.send(embed=embed)
+
     @logs.command(name="responded")
     @checks.has_permissions(PermissionLevel.SUPPORTER)
     async def logs_responded(self, ctx, *, user: User = None):
@@ -1146,6 +1178,7 @@ class Modmail(commands.Cog):
                 if after <= 0:
                     # No longer blocked
                     self.bot.blocked_users.pop(str(id_))
+                    self.bot.blocklist.invalidate()
                     logger.debug("No longer blocked, user %s.", id_)
                     continue
 
@@ -1180,6 +1213,7 @@ class Modmail(commands.Cog):
                 if after <= 0:
                     # No longer blocked
                     self.bot.blocked_roles.pop(str(id_))
+                    self.bot.blocklist.invalidate()
                     logger.debug("No longer blocked, role %s.", id_)
                     continue
 
@@ -1257,6 +1291,8 @@ class Modmail(commands.Cog):
                 color=self.bot.main_color,
             )
             self.bot.blocked_whitelisted_users.remove(str(user.id))
+            self.bot.blocklist.invalidate()
+            await self.bot.config.update()
             return await ctx.send(embed=embed)
 
         self.bot.blocked_whitelisted_users.append(str(user.id))
@@ -1265,6 +1301,7 @@ class Modmail(commands.Cog):
             msg = self.bot.blocked_users.get(str(user.id)) or ""
             self.bot.blocked_users.pop(str(user.id))
 
+        self.bot.blocklist.invalidate()
         await self.bot.config.update()
 
         if msg.startswith("System Message: "):
@@ -1370,6 +1407,7 @@ class Modmail(commands.Cog):
             self.bot.blocked_roles[str(user_or_role.id)] = reason
         else:
             self.bot.blocked_users[str(user_or_role.id)] = reason
+        self.bot.blocklist.invalidate()
         await self.bot.config.update()
 
         return await ctx.send(embed=embed)
@@ -1401,6 +1439,7 @@ class Modmail(commands.Cog):
             and str(user_or_role.id) in self.bot.blocked_users
         ):
             msg = self.bot.blocked_users.pop(str(user_or_role.id)) or ""
+            self.bot.blocklist.invalidate()
             await self.bot.config.update()
 
             if msg.startswith("System Message: "):
@@ -1429,6 +1468,7 @@ class Modmail(commands.Cog):
             and str(user_or_role.id) in self.bot.blocked_roles
         ):
             msg = self.bot.blocked_roles.pop(str(user_or_role.id)) or ""
+            self.bot.blocklist.invalidate()
             await self.bot.config.update()
 
             embed = discord.Embed(
@@ -1486,25 +1526,22 @@ class Modmail(commands.Cog):
             user_id = match_user_id(ctx.channel.topic)
             if user_id == -1:
                 logger.info("Setting current channel's topic to User ID.")
+                self.bot.threads.count_request("repair", "edit_topic")
                 await ctx.channel.edit(topic=f"User ID: {ctx.thread.id}")
+                self.bot.threads.index_channel(ctx.channel, ctx.thread.id)
             return await self.bot.add_reaction(ctx.message, sent_emoji)
 
         logger.info("Attempting to fix a broken thread %s.", ctx.channel.name)
 
         # Search cache for channel
-        user_id, thread = next(
-            (
-                (k, v)
-                for k, v in self.bot.threads.cache.items()
-                if v.channel == ctx.channel
-            ),
-            (-1, None),
-        )
+        thread = self.bot.threads.get_channel_thread(ctx.channel.id)
         if thread is not None:
             logger.debug("Found thread with tempered ID.")
+            self.bot.threads.count_request("repair", "edit_topic")
             await ctx.channel.edit(
-                reason="Fix broken Modmail thread", topic=f"User ID: {user_id}"
+                reason="Fix broken Modmail thread", topic=f"User ID: {thread.id}"
             )
+            self.bot.threads.index_channel(ctx.channel, thread.id)
             return await self.bot.add_reaction(ctx.message, sent_emoji)
 
         # find genesis message to retrieve User ID
@@ -1520,20 +1557,19 @@ class Modmail(commands.Cog):
                 if user_id != -1:
                     recipient = self.bot.get_user(user_id)
                     if recipient is None:
-                        self.bot.threads.cache[user_id] = thread = Thread(
-                            self.bot.threads, user_id, ctx.channel
-                        )
+                        thread = Thread(self.bot.threads, user_id, ctx.channel)
                     else:
-                        self.bot.threads.cache[user_id] = thread = Thread(
-                            self.bot.threads, recipient, ctx.channel
-                        )
+                        thread = Thread(self.bot.threads, recipient, ctx.channel)
+                    self.bot.threads.register(thread)
                     thread.ready = True
                     logger.info(
                         "Setting current channel's topic to User ID and created new thread."
                     )
+                    self.bot.threads.count_request("repair", "edit_topic")
                     await ctx.channel.edit(
                         reason="Fix broken Modmail thread", topic=f"User ID: {user_id}"
                     )
+                    self.bot.threads.index_channel(ctx.channel, user_id)
                     return await self.bot.add_reaction(ctx.message, sent_emoji)
 
         else:
@@ -1571,22 +1607,21 @@ class Modmail(commands.Cog):
                         except discord.HTTPException:
                             pass
                 if recipient is None:
-                    self.bot.threads.cache[user.id] = thread = Thread(
-                        self.bot.threads, user_id, ctx.channel
-                    )
+                    thread = Thread(self.bot.threads, user_id, ctx.channel)
                 else:
-                    self.bot.threads.cache[user.id] = thread = Thread(
-                        self.bot.threads, recipient, ctx.channel
-                    )
+                    thread = Thread(self.bot.threads, recipient, ctx.channel)
+                self.bot.threads.register(thread)
                 thread.ready = True
                 logger.info(
                     "Setting current channel's topic to User ID and created new thread."
                 )
+                self.bot.threads.count_request("repair", "edit_topic")
                 await ctx.channel.edit(
                     reason="Fix broken Modmail thread",
                     name=name,
                     topic=f"User ID: {user.id}",
                 )
+                self.bot.threads.index_channel(ctx.channel, user.id)
                 return await self.bot.add_reaction(ctx.message, sent_emoji)
 
             elif len(users) >= 2:
@@ -1,6 +1,5 @@
 import asyncio
 import os
-import re
 from difflib import get_close_matches
 from io import BytesIO
 from itertools import takewhile, zip_longest
@@ -436,6 +435,31 @@ class Utility(commands.Cog):
             )
         )
 
+    @debug.command(name="metrics", aliases=["stats"])
+    @checks.has_permissions(PermissionLevel.OWNER)
+    async def debug_metrics(self, ctx):
+        """
+        Shows the Discord requests made by the bot.
+
+        The outbound queue is shown by lane and the thread requests by stage.
+        """
+
+        def format_counts(counts):
+            return "\n".join(f"{name}: {count}" for name, count in counts.items())
+
+        outbound = discord.Embed(color=self.bot.main_color, title="Outbound Requests")
+        for lane, counts in self.bot.outbound.metrics.items():
+            outbound.add_field(name=lane.title(), value=format_counts(counts))
+
+        threads = discord.Embed(color=self.bot.main_color, title="Thread Requests")
+        for stage, counts in sorted(self.bot.threads.request_metrics.items()):
+            threads.add_field(name=stage.title(), value=format_counts(counts))
+        if not threads.fields:
+            threads.description = "No thread requests made yet."
+
+        await ctx.send(embed=outbound)
+        await ctx.send(embed=threads)
+
     @commands.command(aliases=["presence"])
     @checks.has_permissions(PermissionLevel.ADMINISTRATOR)
     async def activity(self, ctx, activity_type: str.lower, *, message: str = ""):
@@ -730,6 +754,8 @@ class Utility(commands.Cog):
             try:
                 self.bot.config.set(key, value)
                 await self.bot.config.update()
+                if key == "thread_channel_pool_size":
+                    self.bot.channel_pool.fill()
                 embed = discord.Embed(
                     title="Success",
                     color=self.bot.main_color,
@@ -937,6 +963,7 @@ class Utility(commands.Cog):
                     name=f"{name}` used to be:", value=utils.truncate(val, 1024)
                 )
                 self.bot.aliases.pop(name)
+                self.bot.dispatch_table.invalidate()
                 await self.bot.config.update()
                 return await ctx.send(embed=embed)
 
@@ -1065,6 +1092,7 @@ class Utility(commands.Cog):
                 embed.add_field(name=f"Step {i}:", value=utils.truncate(val, 1024))
 
         self.bot.aliases[name] = " && ".join(f'"{a}"' for a in save_aliases)
+        self.bot.dispatch_table.invalidate()
         await self.bot.config.update()
         return embed
 
@@ -1127,6 +1155,7 @@ class Utility(commands.Cog):
 
         if name in self.bot.aliases:
             self.bot.aliases.pop(name)
+            self.bot.dispatch_table.invalidate()
             await self.bot.config.update()
 
             embed = discord.Embed(
@@ -1787,6 +1816,7 @@ class Utility(commands.Cog):
 
             if valid:
                 self.bot.auto_triggers[keyword] = command
+                self.bot.trigger_index.invalidate()
                 await self.bot.config.update()
 
                 embed = discord.Embed(
@@ -1823,6 +1853,7 @@ class Utility(commands.Cog):
 
             if valid:
                 self.bot.auto_triggers[keyword] = command
+                self.bot.trigger_index.invalidate()
                 await self.bot.config.update()
 
                 embed = discord.Embed(
@@ -1854,6 +1885,7 @@ class Utility(commands.Cog):
             )
             await ctx.send(embed=embed)
         else:
+            self.bot.trigger_index.invalidate()
             await self.bot.config.update()
 
             embed = discord.Embed(
@@ -1867,23 +1899,19 @@ class Utility(commands.Cog):
     @checks.has_permissions(PermissionLevel.OWNER)
     async def autotrigger_test(self, ctx, *, text):
         """Tests a string against the current autotrigger setup"""
-        for keyword in self.bot.auto_triggers:
-            if self.bot.config.get("use_regex_autotrigger"):
-                check = re.search(keyword, text)
-                regex = True
-            else:
-                check = keyword.lower() in text.lower()
-                regex = False
+        regex = self.bot.config.get("use_regex_autotrigger")
+        found = self.bot.trigger_index.match(text, regex=regex)
 
-            if check:
-                alias = self.bot.auto_triggers[keyword]
-                embed = discord.Embed(
-                    title=f"{'Regex ' if regex else ''}Keyword Found",
-                    color=self.bot.main_color,
-                    description=f"autotrigger keyword `{
-                        keyword}` found. Command executed: `{alias}`",
-                )
-                return await ctx.send(embed=embed)
+        if found is not None:
+            keyword, _ = found
+            alias = self.bot.auto_triggers[keyword]
+            embed = discord.Embed(
+                title=f"{'Regex ' if regex else ''}Keyword Found",
+                color=self.bot.main_color,
+                description=f"autotrigger keyword `{
+                    keyword}` found. Command executed: `{alias}`",
+            )
+            return await ctx.send(embed=embed)
 
         embed = discord.Embed(
             title="Keyword Not Found",
@@ -0,0 +1,170 @@
+import heapq
+import re
+import typing
+from datetime import datetime, timezone
+
+import discord
+
+from core.models import getLogger
+
+logger = getLogger(__name__)
+
+# etc "blah blah blah... until 2019-10-14T21:12:45.559948."
+END_TIME_REGEX = re.compile(r"until ([^`]+?)\.$")
+# backwards compat
+OLD_END_TIME_REGEX = re.compile(r"%([^%]+?)%")
+
+
+def parse_end_time(reason: str, name: str = None) -> typing.Optional[datetime]:
+    """
+    Parses the end time out of a block reason.
+
+    Parameters
+    ----------
+    reason : str
+        The block reason.
+    name : str, optional
+        The name of what is blocked, used for warnings.
+
+    Returns
+    -------
+    Optional[datetime]
+        The naive UTC end time, or `None` if the block is permanent.
+    """
+    end_time = END_TIME_REGEX.search(reason)
+    if end_time is None:
+        end_time = OLD_END_TIME_REGEX.search(reason)
+        if end_time is not None:
+            logger.warning(
+                r"Deprecated time message for %s, block and unblock again to update.",
+                name,
+            )
+    if end_time is None:
+        return None
+
+    try:
+        end = datetime.fromisoformat(end_time.group(1))
+    except ValueError:
+        logger.warning("Invalid block end time for %s, blocking permanently.", name)
+        return None
+    if end.tzinfo is not None:
+        end = end.astimezone(timezone.utc).replace(tzinfo=None)
+    return end
+
+
+class BlockList:
+    """
+    Precomputed view of the blocked users, roles and the whitelist.
+
+    Block reasons are parsed once when the lists change, checking a user
+    only does set lookups. Timed blocks are expired from a min-heap.
+    `invalidate` must be called after mutating the lists in place.
+
+    Parameters
+    ----------
+    bot : Bot
+        The Modmail bot.
+
+    Attributes
+    ----------
+    changed : bool
+        Whether expired or system blocks were removed from the config
+        since the last `config.update()`.
+    """
+
+    def __init__(self, bot):
+        self.bot = bot
+        self.changed = False
+        self._valid = False
+        self._sources = (None, None, None)
+        self._users = {}  # user ID -> end time or None
+        self._roles = {}  # role ID -> end time or None
+        self._system_users = set()
+        self._whitelist = set()
+        self._expiries = []  # heap of (end time, is role, ID)
+
+    def invalidate(self) -> None:
+        """Marks the lists as changed, they are parsed again on the next check."""
+        self._valid = False
+
+    def _sync(self) -> None:
+        sources = (
+            self.bot.blocked_users,
+            self.bot.blocked_roles,
+            self.bot.blocked_whitelisted_users,
+        )
+        if self._valid and all(a is b for a, b in zip(sources, self._sources)):
+            return
+
+        users, roles, whitelist = sources
+        self._users = {}
+        self._roles = {}
+        self._system_users = set()
+        self._expiries = []
+
+        for id_, reason in users.items():
+            reason = reason or ""
+            if reason.startswith("System Message:"):
+                self._system_users.add(int(id_))
+            self._users[int(id_)] = end = parse_end_time(reason, f"user {id_}")
+            if end is not None:
+                self._expiries.append((end, False, int(id_)))
+
+        for id_, reason in roles.items():
+            self._roles[int(id_)] = end = parse_end_time(reason or "", f"role {id_}")
+            if end is not None:
+                self._expiries.append((end, True, int(id_)))
+
+        heapq.heapify(self._expiries)
+        self._whitelist = {int(id_) for id_ in whitelist}
+        self._sources = sources
+        self._valid = True
+
+    def _expire(self) -> None:
+        now = datetime.utcnow()
+        while self._expiries and self._expiries[0][0] <= now:
+            end, is_role, id_ = heapq.heappop(self._expiries)
+            blocks = self._roles if is_role else self._users
+            if id_ not in blocks or blocks[id_] != end:
+                # re-blocked or unblocked since
+                continue
+            del blocks[id_]
+            if is_role:
+                self.bot.blocked_roles.pop(str(id_), None)
+                logger.debug("No longer blocked, role %s.", id_)
+            else:
+                self.bot.blocked_users.pop(str(id_), None)
+                logger.debug("No longer blocked, user %s.", id_)
+            self.changed = True
+
+    def is_whitelisted(self, user_id: int) -> bool:
+        self._sync()
+        return user_id in self._whitelist
+
+    def is_user_blocked(self, user_id: int) -> bool:
+        """
+        Whether the user is blocked manually, system blocks are lifted
+        as the account and guild age were checked beforehand.
+        """
+        self._sync()
+        self._expire()
+        if user_id not in self._users:
+            return False
+
+        if user_id in self._system_users:
+            # Met the limits already, otherwise it would've been caught by the previous checks
+            logger.debug("No longer internally blocked, user %s.", user_id)
+            del self._users[user_id]
+            self._system_users.discard(user_id)
+            self.bot.blocked_users.pop(str(user_id), None)
+            self.changed = True
+            return False
+        return True
+
+    def is_role_blocked(self, member: discord.Member) -> bool:
+        """Whether any of the roles of the member is blocked."""
+        self._sync()
+        self._expire()
+        if not self._roles:
+            return False
+        return any(role.id in self._roles for role in member.roles)
@@ -0,0 +1,344 @@
+import asyncio
+import typing
+from collections import Counter
+
+import discord
+
+from core.models import getLogger
+
+logger = getLogger(__name__)
+
+
+class CategoryPool:
+    """
+    Tracks the free channel slots of the modmail guild categories.
+
+    The channel count of every category and the names of the text channels
+    are indexed once and then kept up to date from the channel events, so
+    picking a category or a channel name doesn't walk every channel of the
+    guild. Slots are handed out under a lock and stay reserved until the
+    thread channel is created, so a burst of new threads fills a category
+    exactly and clones at most one fallback category.
+
+    Parameters
+    ----------
+    bot : Bot
+        The Modmail bot.
+    """
+
+    # Discord allows 50 channels per category, one is left spare
+    MAX_CHANNELS = 49
+
+    def __init__(self, bot):
+        self.bot = bot
+        self._guild = None
+        self._channels = {}  # channel ID -> (category ID, text channel name)
+        self._counts = Counter()  # category ID -> channels
+        self._reserved = Counter()  # category ID -> slots handed out
+        self._names = Counter()  # text channel name -> channels
+        self._lock = asyncio.Lock()
+
+    def invalidate(self) -> None:
+        """Drops the index, it's rebuilt from the guild lazily."""
+        self._guild = None
+
+    def _sync(self) -> typing.Optional[discord.Guild]:
+        guild = self.bot.modmail_guild
+        if guild is self._guild:
+            return guild
+
+        self._channels.clear()
+        self._counts.clear()
+        self._names.clear()
+        self._reserved.clear()
+        self._guild = guild
+        if guild is not None:
+            for channel in guild.channels:
+                self._add(channel)
+        return guild
+
+    def _add(self, channel: discord.abc.GuildChannel) -> None:
+        if channel.id in self._channels or isinstance(
+            channel, discord.CategoryChannel
+        ):
+            return
+        name = channel.name if isinstance(channel, discord.TextChannel) else None
+        self._channels[channel.id] = (channel.category_id, name)
+        if channel.category_id is not None:
+            self._counts[channel.category_id] += 1
+        if name is not None:
+            self._names[name] += 1
+
+    def _remove(self, channel_id: int) -> None:
+        entry = self._channels.pop(channel_id, None)
+        if entry is None:
+            return
+        category_id, name = entry
+        if category_id is not None:
+            self._counts[category_id] -= 1
+            if self._counts[category_id] <= 0:
+                del self._counts[category_id]
+        if name is not None:
+            self._names[name] -= 1
+            if self._names[name] <= 0:
+                del self._names[name]
+
+    def channel_created(self, channel: discord.abc.GuildChannel) -> None:
+        """Records a new channel, does nothing if it's already known."""
+        if self._sync() == channel.guild:
+            self._add(channel)
+
+    def channel_updated(
+        self, before: discord.abc.GuildChannel, after: discord.abc.GuildChannel
+    ) -> None:
+        """Records a channel that was renamed or moved to another category."""
+        if self._sync() != after.guild or after.id not in self._channels:
+            return
+        if before.name != after.name or before.category_id != after.category_id:
+            self._remove(after.id)
+            self._add(after)
+
+    def channel_deleted(self, channel: discord.abc.GuildChannel) -> None:
+        """Forgets a deleted channel."""
+        if self._sync() != channel.guild:
+            return
+        self._remove(channel.id)
+        if isinstance(channel, discord.CategoryChannel):
+            self._counts.pop(channel.id, None)
+            self._reserved.pop(channel.id, None)
+
+    def free_slots(self, category: discord.CategoryChannel) -> int:
+        """The number of channels that can still be created in a category."""
+        self._sync()
+        used = self._counts[category.id] + self._reserved[category.id]
+        return max(self.MAX_CHANNELS - used, 0)
+
+    def is_name_taken(
+        self, name: str, exclude_channel: discord.TextChannel = None
+    ) -> bool:
+        """Whether a text channel of the modmail guild already has the name."""
+        self._sync()
+        count = self._names[name]
+        if exclude_channel is not None and exclude_channel.id in self._channels:
+            if self._channels[exclude_channel.id][1] == name:
+                count -= 1
+        return count > 0
+
+    async def acquire(
+        self, category: discord.CategoryChannel = None
+    ) -> typing.Optional[discord.CategoryChannel]:
+        """
+        Reserves a slot for a new thread channel.
+
+        The main category is used while it has free slots, then the
+        fallback category, and a new fallback category is cloned from
+        the main one when both are full.
+
+        Parameters
+        ----------
+        category : CategoryChannel, optional
+            The category to use, reserved without checking its slots.
+
+        Returns
+        -------
+        Optional[CategoryChannel]
+            The category to create the channel in. It must be given back
+            with `release` once the channel is created or creation failed.
+        """
+        async with self._lock:
+            guild = self._sync()
+            if category is None:
+                category = self.bot.main_category
+                if category is not None and not self.free_slots(category):
+                    category = await self._fallback(category)
+
+            if category is not None and guild is not None:
+                self._reserved[category.id] += 1
+            return category
+
+    async def _fallback(
+        self, main: discord.CategoryChannel
+    ) -> discord.CategoryChannel:
+        fallback_id = self.bot.config["fallback_category_id"]
+        if fallback_id:
+            fallback = main.guild.get_channel(int(fallback_id))
+            if isinstance(fallback, discord.CategoryChannel) and self.free_slots(
+                fallback
+            ):
+                return fallback
+
+        fallback = await main.clone(name="Fallback Modmail")
+        logger.info("Created fallback category %s.", fallback.id)
+        self.bot.config.set("fallback_category_id", str(fallback.id))
+        await self.bot.config.update()
+        return fallback
+
+    def release(
+        self,
+        category: typing.Optional[discord.CategoryChannel],
+        channel: discord.abc.GuildChannel = None,
+    ) -> None:
+        """
+        Gives back a slot from `acquire`.
+
+        Parameters
+        ----------
+        category : CategoryChannel, optional
+            The category returned by `acquire`.
+        channel : GuildChannel, optional
+            The channel that was created, if any.
+        """
+        if channel is not None:
+            self.channel_created(channel)
+        if category is not None and self._reserved[category.id] > 0:
+            self._reserved[category.id] -= 1
+            if not self._reserved[category.id]:
+                del self._reserved[category.id]
+
+
+class ChannelPool:
+    """
+    Hidden thread channels created ahead of time in the main category.
+
+    New threads claim a pooled channel and reveal it with a single edit
+    that renames it, sets its topic and syncs its permissions with the
+    category, instead of creating a channel first. The pool is refilled
+    in the background up to the `thread_channel_pool_size` config, and
+    is disabled when that is 0.
+
+    Parameters
+    ----------
+    bot : Bot
+        The Modmail bot.
+    """
+
+    # marks the pooled channels, so they are found again after a restart
+    TOPIC = "Modmail: reserved thread channel."
+    NAME = "modmail-reserved"
+
+    def __init__(self, bot):
+        self.bot = bot
+        self._channels = []
+        self._fill_task = None
+
+    def __len__(self):
+        return len(self._channels)
+
+    @property
+    def size(self) -> int:
+        """The number of channels to keep in the pool."""
+        size = self.bot.config["thread_channel_pool_size"]
+        try:
+            return max(int(size or 0), 0)
+        except ValueError:
+            logger.warning("Invalid THREAD_CHANNEL_POOL_SIZE %r, disabled.", size)
+            return 0
+
+    def start(self) -> None:
+        """Picks up the pooled channels left by a restart and fills the pool."""
+        category = self.bot.main_category
+        if category is not None:
+            self._channels = [
+                c
+                for c in category.text_channels
+                if c.topic == self.TOPIC and c not in self._channels
+            ] + self._channels
+        logger.debug("Found %d pooled thread channel(s).", len(self._channels))
+        self.fill()
+
+    def fill(self) -> None:
+        """Refills the pool in the background."""
+        if self._fill_task is None or self._fill_task.done():
+            self._fill_task = self.bot.loop.create_task(self._fill())
+
+    async def _fill(self) -> None:
+        category_pool = self.bot.category_pool
+        while len(self._channels) < self.size:
+            category = self.bot.main_category
+            # leave a slot for threads that don't wait for the pool
+            if category is None or category_pool.free_slots(category) <= 1:
+                return
+
+            category = await category_pool.acquire(category)
+            channel = None
+            try:
+                channel = await category.create_text_channel(
+                    name=self.NAME,
+                    topic=self.TOPIC,
+                    overwrites={
+                        category.guild.default_role: discord.PermissionOverwrite(
+                            read_messages=False
+                        ),
+                        category.guild.me: discord.PermissionOverwrite(
+                            read_messages=True, manage_channels=True
+                        ),
+                    },
+                    reason="Creating a reserved thread channel.",
+                )
+            except discord.HTTPException:
+                logger.warning("Failed to create a pooled channel.", exc_info=True)
+                return
+            finally:
+                category_pool.release(category, channel)
+            self._channels.append(channel)
+
+    def channel_deleted(self, channel: discord.abc.GuildChannel) -> None:
+        """Forgets a pooled channel that was deleted."""
+        if channel in self._channels:
+            self._channels.remove(channel)
+
+    async def claim(
+        self, name: str, topic: str
+    ) -> typing.Optional[discord.TextChannel]:
+        """
+        Reveals a pooled channel for a new thread.
+
+        Parameters
+        ----------
+        name : str
+            The name of the thread channel.
+        topic : str
+            The topic of the thread channel.
+
+        Returns
+        -------
+        Optional[TextChannel]
+            The channel, or `None` if the pool is empty.
+        """
+        category = self.bot.main_category
+        channel = None
+        while self._channels and channel is None:
+            pooled = self._channels.pop()
+            if pooled.category_id != getattr(category, "id", None):
+                # the main category was changed, the channel is of no use
+                self.bot.loop.create_task(self._delete(pooled))
+                continue
+
+            try:
+                await pooled.edit(
+                    name=name,
+                    topic=topic,
+                    sync_permissions=True,
+                    reason="Creating a thread channel.",
+                )
+            except discord.NotFound:
+                continue
+            except discord.HTTPException:
+                logger.warning("Failed to claim a pooled channel.", exc_info=True)
+                self._channels.append(pooled)
+                break
+            channel = pooled
+
+        if self.size:
+            self.fill()
+        return channel
+
+    async def _delete(self, channel: discord.TextChannel) -> None:
+        try:
+            await channel.delete(reason="Removing a stale reserved thread channel.")
+        except discord.NotFound:
+            pass
+        except discord.HTTPException:
+            logger.warning(
+                "Failed to delete the pooled channel %s.", channel.id, exc_info=True
+            )
@@ -1,3 +1,5 @@
+import typing
+
 from discord.ext import commands
 
 from core.models import HostingMethod, PermissionLevel, getLogger
@@ -37,6 +39,124 @@ def has_permissions(permission_level: PermissionLevel = PermissionLevel.REGULAR)
     return commands.check(has_permissions_predicate(permission_level))
 
 
+class PermissionResolver:
+    """
+    Precomputed lookups for `check_permissions`.
+
+    The IDs in `command_permissions` and `level_permissions` are parsed
+    once, and every permission level maps to the IDs of all the levels
+    at or above it, so a check is a set intersection. The lookups are
+    rebuilt when the permission configs are replaced or after
+    `invalidate` is called.
+
+    Parameters
+    ----------
+    bot : Bot
+        The Modmail bot.
+    """
+
+    def __init__(self, bot):
+        self.bot = bot
+        self._valid = False
+        self._sources = (None, None, None)
+        self._owner_ids = frozenset()
+        # name -> (allows @everyone, IDs)
+        self._commands = {}
+        # level -> (allows @everyone, IDs of this level and above)
+        self._levels = {}
+
+    def invalidate(self) -> None:
+        """Marks the permissions as changed, they are parsed again on the next check."""
+        self._valid = False
+
+    @staticmethod
+    def _parse(ids) -> typing.Tuple[bool, typing.FrozenSet[int]]:
+        everyone = False
+        parsed = set()
+        for id_ in ids:
+            if id_ == -1:
+                # -1 is for @everyone
+                everyone = True
+                continue
+            try:
+                parsed.add(int(id_))
+            except (TypeError, ValueError):
+                logger.warning("Invalid ID in permissions, %s.", id_)
+        return everyone, frozenset(parsed)
+
+    def _sync(self) -> None:
+        config = self.bot.config
+        sources = (
+            config["owners"],
+            config["command_permissions"],
+            config["level_permissions"],
+        )
+        if self._valid and all(a is b for a, b in zip(sources, self._sources)):
+            return
+
+        owners, command_permissions, level_permissions = sources
+        owner_ids = set()
+        if owners is not None:
+            owner_ids.update(map(int, str(owners).split(",")))
+        owner_ids.update(
+            map(int, level_permissions.get(PermissionLevel.OWNER.name, []))
+        )
+        self._owner_ids = frozenset(owner_ids)
+
+        self._commands = {
+            name: self._parse(ids) for name, ids in command_permissions.items()
+        }
+
+        self._levels = {}
+        everyone, ids = False, frozenset()
+        for level in sorted(PermissionLevel, reverse=True):
+            if level.name in level_permissions:
+                level_everyone, level_ids = self._parse(level_permissions[level.name])
+                everyone = everyone or level_everyone
+                ids = ids | level_ids
+            self._levels[level] = everyone, ids
+
+        self._sources = sources
+        self._valid = True
+
+    def is_owner_id(self, user_id: int) -> bool:
+        """Whether the ID is one of the configured owners."""
+        self._sync()
+        return user_id in self._owner_ids
+
+    def is_allowed(
+        self,
+        command_name: str,
+        permission_level: PermissionLevel,
+        ids: typing.AbstractSet[int],
+    ) -> bool:
+        """
+        Whether any of the IDs may use the command.
+
+        Parameters
+        ----------
+        command_name : str
+            The qualified name of the command.
+        permission_level : PermissionLevel
+            The permission level of the command.
+        ids : Set[int]
+            The IDs of the author and their roles.
+
+        Returns
+        -------
+        bool
+            `True` if the command or a high enough level is granted.
+        """
+        self._sync()
+        for everyone, allowed in (
+            self._commands.get(command_name, (False, frozenset())),
+            self._levels.get(permission_level, (False, frozenset())),
+        ):
+            if everyone or not allowed.isdisjoint(ids):
+                return True
+        return False
+
+
 async def check_permissions(ctx, command_name) -> bool:
     """Logic for checking permissions for a command for a user"""
     if await ctx.bot.is_owner(ctx.author):
@@ -58,26 +178,8 @@ async def check_permissions(ctx, command_name) -> bool:
         logger.debug("Allowed due to administrator.")
         return True
 
-    command_permissions = ctx.bot.config["command_permissions"]
-    checkables = {*ctx.author.roles, ctx.author}
-
-    if command_name in command_permissions:
-        # -1 is for @everyone
-        if -1 in command_permissions[command_name] or any(
-            str(check.id) in command_permissions[command_name] for check in checkables
-        ):
-            return True
-
-    level_permissions = ctx.bot.config["level_permissions"]
-
-    for level in PermissionLevel:
-        if level >= permission_level and level.name in level_permissions:
-            # -1 is for @everyone
-            if -1 in level_permissions[level.name] or any(
-                str(check.id) in level_permissions[level.name] for check in checkables
-            ):
-                return True
-    return False
+    ids = {ctx.author.id, *(role.id for role in ctx.author.roles)}
+    return ctx.bot.permission_resolver.is_allowed(command_name, permission_level, ids)
 
 
 def thread_only():
@@ -1,5 +1,7 @@
+import asyncio
 import secrets
 import sys
+from collections import Counter
 from datetime import datetime
 from json import JSONDecodeError
 from typing import Union, Optional
@@ -9,7 +11,8 @@ from discord.ext import commands
 
 from aiohttp import ClientResponseError, ClientResponse
 from motor.motor_asyncio import AsyncIOMotorClient
-from pymongo.errors import ConfigurationError
+from pymongo import ASCENDING, DESCENDING, DeleteOne, ReplaceOne, UpdateOne
+from pymongo.errors import BulkWriteError, ConfigurationError, OperationFailure
 
 from core.models import InvalidConfigError, getLogger
 
@@ -304,7 +307,7 @@ class ApiClient:
     async def get_responded_logs(self, user_id: Union[str, int]) -> list:
         return NotImplemented
 
-    async def get_open_logs(self) -> list:
+    async def get_open_logs(self, *, projection: dict = None) -> list:
         return NotImplemented
 
     async def get_log(self, channel_id: Union[str, int]) -> dict:
@@ -327,7 +330,16 @@ class ApiClient:
     async def update_config(self, data: dict):
         return NotImplemented
 
-    async def edit_message(self, message_id: Union[int, str], new_content: str) -> None:
+    async def patch_config(self, toset: dict, unset: list):
+        return NotImplemented
+
+    async def edit_message(
+        self,
+        message_id: Union[int, str],
+        new_content: str,
+        *,
+        channel_id: Union[int, str] = None,
+    ) -> None:
         return NotImplemented
 
     async def append_log(
@@ -337,10 +349,43 @@ class ApiClient:
         message_id: str = "",
         channel_id: str = "",
         type_: str = "thread_message",
+    ) -> None:
+        return NotImplemented
+
+    async def flush_logs(self, channel_id: Union[int, str] = None) -> None:
+        return NotImplemented
+
+    async def post_log(
+        self, channel_id: Union[int, str], data: dict, *, projection: dict = None
     ) -> dict:
         return NotImplemented
 
-    async def post_log(self, channel_id: Union[int, str], data: dict) -> dict:
+    async def close_logs(self, channel_ids: list, data: dict) -> int:
+        return NotImplemented
+
+    async def get_closures(self) -> list:
+        return NotImplemented
+
+    async def update_closures(self, closures: list, removed: list) -> None:
+        return NotImplemented
+
+    async def create_message_link(
+        self,
+        thread_message_id: Union[int, str],
+        dm_message_id: Union[int, str],
+        channel_id: Union[int, str],
+    ):
+        return NotImplemented
+
+    async def find_message_link(
+        self,
+        *,
+        thread_message_id: Union[int, str] = None,
+        dm_message_id: Union[int, str] = None,
+    ) -> Optional[dict]:
+        return NotImplemented
+
+    async def delete_message_links(self, channel_id: Union[int, str]) -> int:
         return NotImplemented
 
     async def search_closed_by(self, user_id: Union[int, str]):
@@ -366,11 +411,84 @@ class ApiClient:
     async def edit_note(self, message_id: Union[int, str], message: str):
         return NotImplemented
 
+    async def migrate_log_messages(self) -> int:
+        return NotImplemented
+
     def get_plugin_partition(self, cog):
         return NotImplemented
 
 
 class MongoDBClient(ApiClient):
+    """
+    MongoDB client.
+
+    Log messages are buffered per channel by `append_log` and written
+    in batches, either after `LOG_FLUSH_DELAY` seconds or once a channel
+    buffers `LOG_FLUSH_SIZE` messages. Use `flush_logs` to write them
+    immediately, messages that fail to be written are kept in the buffer.
+    Messages of a channel that has no log are retried `LOG_LOOKUP_RETRIES`
+    times, in case the log is still being created, then dropped.
+    """
+
+    LOG_FLUSH_DELAY = 0.5
+    LOG_FLUSH_SIZE = 50
+    LOG_LOOKUP_RETRIES = 3
+
+    RESPONDED_TYPES = ["anonymous", "thread_message"]
+
+    # collection -> [(index keys, sample query served by the index)]
+    # the sample queries are explained on startup to report collection scans
+    INDEX_MANIFEST = {
+        "logs": [
+            ([("channel_id", ASCENDING)], {"channel_id": "0"}),
+            (
+                [
+                    ("recipient.id", ASCENDING),
+                    ("guild_id", ASCENDING),
+                    ("open", ASCENDING),
+                    ("closed_at", DESCENDING),
+                ],
+                {"recipient.id": "0", "guild_id": "0", "open": False},
+            ),
+            ([("messages.message_id", ASCENDING)], {"messages.message_id": "0"}),
+            (
+                [("closer.id", ASCENDING)],
+                {"guild_id": "0", "open": False, "closer.id": "0"},
+            ),
+            ([("open", ASCENDING)], {"open": True}),
+        ],
+        "notes": [
+            ([("recipient", ASCENDING)], {"recipient": "0"}),
+            ([("message_id", ASCENDING)], {"message_id": "0"}),
+        ],
+        "message_links": [
+            ([("thread_message_id", ASCENDING)], {"thread_message_id": "0"}),
+            ([("dm_message_id", ASCENDING)], {"dm_message_id": "0"}),
+            ([("channel_id", ASCENDING)], {"channel_id": "0"}),
+        ],
+        "log_messages": [
+            ([("log_key", ASCENDING), ("_id", ASCENDING)], {"log_key": ""}),
+            (
+                [("log_key", ASCENDING), ("message_id", ASCENDING)],
+                {"log_key": "", "message_id": "0"},
+            ),
+            ([("message_id", ASCENDING)], {"message_id": "0"}),
+            (
+                [("author.id", ASCENDING), ("author.mod", ASCENDING)],
+                {"author.id": "0", "author.mod": True},
+            ),
+        ],
+        "config": [([("bot_id", ASCENDING)], {"bot_id": 0})],
+        "tags": [([("name", ASCENDING)], {"name": ""})],
+        "starred_messages": [([("message_id", ASCENDING)], {"message_id": 0})],
+        "closures": [
+            (
+                [("recipient_id", ASCENDING), ("auto_close", ASCENDING)],
+                {"recipient_id": "0", "auto_close": False},
+            )
+        ],
+    }
+
     def __init__(self, bot):
         mongo_uri = bot.config["connection_uri"]
         if mongo_uri is None:
@@ -395,9 +513,17 @@ class MongoDBClient(ApiClient):
             sys.exit(0)
 
         super().__init__(bot, db)
+        self._pending_logs = {}  # channel ID -> list of messages
+        self._log_keys = {}  # channel ID -> log key
+        self._missing_logs = Counter()  # channel ID -> failed log lookups
+        self._flush_task = None
+        self._flush_lock = asyncio.Lock()
 
     async def setup_indexes(self):
-        """Setup text indexes so we can use the $search operator"""
+        """
+        Setup text indexes so we can use the $search operator,
+        and the indexes of `INDEX_MANIFEST` for the frequent queries.
+        """
         coll = self.db.logs
         index_name = "messages.content_text_messages.author.name_text_key_text"
 
@@ -419,8 +545,65 @@ class MongoDBClient(ApiClient):
                     ("key", "text"),
                 ]
             )
+
+        message_index_name = "content_text_author.name_text"
+        if message_index_name not in await self.log_messages.index_information():
+            logger.info('Creating "text" index for log_messages collection.')
+            await self.log_messages.create_index(
+                [("content", "text"), ("author.name", "text")]
+            )
+
+        for name, indexes in self.INDEX_MANIFEST.items():
+            coll = self.db[name]
+            existing = [
+                [(k, int(v) if isinstance(v, float) else v) for k, v in info["key"]]
+                for info in (await coll.index_information()).values()
+            ]
+            for keys, _ in indexes:
+                if keys not in existing:
+                    logger.info("Creating index %s for %s collection.", keys, name)
+                    await coll.create_index(keys)
+
+        await self.verify_indexes()
         logger.debug("Successfully configured and verified database indexes.")
 
+    async def verify_indexes(self) -> list:
+        """
+        Explains the sample queries of `INDEX_MANIFEST`.
+
+        Returns
+        -------
+        List[Tuple[str, Dict[str, Any]]]
+            The collection name and query of every query that
+            would result in a collection scan.
+        """
+
+        def is_collection_scan(plan):
+            if plan.get("stage") == "COLLSCAN":
+                return True
+            children = plan.get("inputStages", [])
+            if "inputStage" in plan:
+                children = [plan["inputStage"], *children]
+            return any(is_collection_scan(p) for p in children)
+
+        scans = []
+        for name, indexes in self.INDEX_MANIFEST.items():
+            for _, query in indexes:
+                try:
+                    explained = await self.db[name].find(query).explain()
+                    plan = explained["queryPlanner"]["winningPlan"]
+                except Exception as e:
+                    logger.debug("Unable to explain query on %s: %s.", name, e)
+                    continue
+                if is_collection_scan(plan):
+                    logger.warning(
+                        "Query on %s collection by %s results in a collection scan.",
+                        name,
+                        ", ".join(query),
+                    )
+                    scans.append((name, query))
+        return scans
+
     async def validate_database_connection(self):
         try:
             await self.db.command("buildinfo")
@@ -452,12 +635,70 @@ class MongoDBClient(ApiClient):
             logger.debug("Successfully connected to the database.")
         logger.line("debug")
 
+    @property
+    def log_messages(self):
+        return self.db.log_messages
+
+    @property
+    def separate_log_messages(self) -> bool:
+        """
+        Whether log messages are stored as one document per message
+        in the `log_messages` collection instead of the log document.
+        """
+        return self.bot.config.get("separate_log_messages")
+
+    async def _attach_messages(self, logs: list, limit: int = None) -> list:
+        """
+        Compatibility read path for the separate messages layout,
+        adds the messages of `log_messages` to the `messages` of the logs.
+        """
+        if not self.separate_log_messages:
+            return logs
+
+        async def attach(log):
+            embedded = log.get("messages") or []
+            if limit is not None and len(embedded) >= limit:
+                return
+            cursor = self.log_messages.find(
+                {"log_key": log["key"]},
+                {"_id": False, "log_key": False, "channel_id": False},
+            ).sort("_id", ASCENDING)
+            if limit is not None:
+                cursor = cursor.limit(limit - len(embedded))
+            log["messages"] = embedded + await cursor.to_list(None)
+
+        await asyncio.gather(*(attach(log) for log in logs if log and "key" in log))
+        return logs
+
+    async def _flush_before_read(self, channel_id: Union[str, int]) -> None:
+        # the buffered messages of an open log are part of what is read
+        if str(channel_id) not in self._pending_logs:
+            return
+        try:
+            await self.flush_logs(channel_id)
+        except Exception:
+            logger.warning(
+                "Failed to write the buffered messages of channel %s.",
+                channel_id,
+                exc_info=True,
+            )
+
+    async def _get_log_keys(self, channel_ids: list) -> dict:
+        missing = [c for c in channel_ids if c not in self._log_keys]
+        if missing:
+            async for log in self.logs.find(
+                {"channel_id": {"$in": missing}}, {"key": True, "channel_id": True}
+            ):
+                self._log_keys[log["channel_id"]] = log["key"]
+        return {c: self._log_keys[c] for c in channel_ids if c in self._log_keys}
+
     async def get_user_logs(self, user_id: Union[str, int]) -> list:
         query = {"recipient.id": str(user_id), "guild_id": str(self.bot.guild_id)}
         projection = {"messages": {"$slice": 5}}
         logger.debug("Retrieving user %s logs.", user_id)
 
-        return await self.logs.find(query, projection).to_list(None)
+        logs = await self.logs.find(query, projection).to_list(None)
+        return await self._attach_messages(logs, limit=5)
 
     async def get_latest_user_logs(self, user_id: Union[str, int]):
         query = {
@@ -468,9 +709,11 @@ class MongoDBClient(ApiClient):
         projection = {"messages": {"$slice": 5}}
         logger.debug("Retrieving user %s latest logs.", user_id)
 
-        return await self.logs.find_one(
+        log = await self.logs.find_one(
             query, projection, limit=1, sort=[("closed_at", -1)]
         )
+        await self._attach_messages([log], limit=5)
+        return log
 
     async def get_responded_logs(self, user_id: Union[str, int]) -> list:
         query = {
@@ -479,22 +722,43 @@ class MongoDBClient(ApiClient):
                 "$elemMatch": {
                     "author.id": str(user_id),
                     "author.mod": True,
-                    "type": {"$in": ["anonymous", "thread_message"]},
+                    "type": {"$in": self.RESPONDED_TYPES},
                 }
             },
         }
-        return await self.logs.find(query).to_list(None)
+        if self.separate_log_messages:
+            keys = await self.log_messages.distinct(
+                "log_key",
+                {
+                    "author.id": str(user_id),
+                    "author.mod": True,
+                    "type": {"$in": self.RESPONDED_TYPES},
+                },
+            )
+            query = {
+                "open": False,
+                "$or": [{"messages": query["messages"]}, {"key": {"$in": keys}}],
+            }
+        logs = await self.logs.find(query).to_list(None)
+        return await self._attach_messages(logs)
 
-    async def get_open_logs(self) -> list:
+    async def get_open_logs(self, *, projection: dict = None) -> list:
         query = {"open": True}
-        return await self.logs.find(query).to_list(None)
+        logs = await self.logs.find(query, projection).to_list(None)
+        if projection is None:
+            await self._attach_messages(logs)
+        return logs
 
     async def get_log(self, channel_id: Union[str, int]) -> dict:
         logger.debug("Retrieving channel %s logs.", channel_id)
-        return await self.logs.find_one({"channel_id": str(channel_id)})
+        await self._flush_before_read(channel_id)
+        log = await self.logs.find_one({"channel_id": str(channel_id)})
+        await self._attach_messages([log])
+        return log
 
     async def get_log_link(self, channel_id: Union[str, int]) -> str:
-        doc = await self.get_log(channel_id)
+        await self._flush_before_read(channel_id)
+        doc = await self.logs.find_one({"channel_id": str(channel_id)}, {"key": True})
         logger.debug("Retrieving log link for channel %s.", channel_id)
         prefix = self.bot.config["log_url_prefix"].strip("/")
         if prefix == "NONE":
@@ -534,6 +798,7 @@ class MongoDBClient(ApiClient):
                 "messages": [],
             }
         )
+        self._log_keys[str(channel.id)] = key
         logger.debug("Created a log entry, key %s.", key)
         prefix = self.bot.config["log_url_prefix"].strip("/")
         if prefix == "NONE":
@@ -542,6 +807,7 @@ class MongoDBClient(ApiClient):
 
     async def delete_log_entry(self, key: str) -> bool:
         result = await self.logs.delete_one({"key": key})
+        await self.log_messages.delete_many({"log_key": key})
         return result.deleted_count == 1
 
     async def get_config(self) -> dict:
@@ -571,9 +837,47 @@ class MongoDBClient(ApiClient):
                 {"bot_id": self.bot.user.id}, {"$unset": unset}
             )
 
-    async def edit_message(self, message_id: Union[int, str], new_content: str) -> None:
+    async def patch_config(self, toset: dict, unset: list):
+        """Sets and unsets only the given configuration keys."""
+        update = {}
+        if toset:
+            update["$set"] = toset
+        if unset:
+            update["$unset"] = {k: 1 for k in unset}
+        if update:
+            return await self.db.config.update_one(
+                {"bot_id": self.bot.user.id}, update
+            )
+
+    async def edit_message(
+        self,
+        message_id: Union[int, str],
+        new_content: str,
+        *,
+        channel_id: Union[int, str] = None,
+    ) -> None:
+        for messages in self._pending_logs.values():
+            for data in messages:
+                if data["message_id"] == str(message_id):
+                    data["content"] = new_content
+                    data["edited"] = True
+                    return
+
+        if self.separate_log_messages:
+            query = {"message_id": str(message_id)}
+            if channel_id is not None:
+                query["channel_id"] = str(channel_id)
+            result = await self.log_messages.update_one(
+                query, {"$set": {"content": new_content, "edited": True}}
+            )
+            if result.matched_count:
+                return
+
+        query = {"messages.message_id": str(message_id)}
+        if channel_id is not None:
+            query["channel_id"] = str(channel_id)
         await self.logs.update_one(
-            {"messages.message_id": str(message_id)},
+            query,
             {"$set": {"messages.$.content": new_content, "messages.$.edited": True}},
         )
 
@@ -584,7 +888,7 @@ class MongoDBClient(ApiClient):
         message_id: str = "",
         channel_id: str = "",
         type_: str = "thread_message",
-    ) -> dict:
+    ) -> None:
         channel_id = str(channel_id) or str(message.channel.id)
         message_id = str(message_id) or str(message.id)
 
@@ -612,19 +916,332 @@ class MongoDBClient(ApiClient):
             ],
         }
 
-        return await self.logs.find_one_and_update(
-            {"channel_id": channel_id},
-            {"$push": {"messages": data}},
+        pending = self._pending_logs.setdefault(channel_id, [])
+        pending.append(data)
+
+        if len(pending) >= self.LOG_FLUSH_SIZE:
+            try:
+                await self.flush_logs(channel_id)
+            except Exception:
+                # the message was already delivered, the batch is kept
+                logger.debug("Log flush failed.", exc_info=True)
+        elif self._flush_task is None:
+            self._flush_task = self.bot.loop.create_task(self._flush_logs_later())
+
+    async def _flush_logs_later(self) -> None:
+        try:
+            await asyncio.sleep(self.LOG_FLUSH_DELAY)
+        finally:
+            self._flush_task = None
+        try:
+            await self.flush_logs()
+        except Exception:
+            # retried by the next append, thread close or shutdown
+            logger.debug("Delayed log flush failed.", exc_info=True)
+
+    async def flush_logs(self, channel_id: Union[int, str] = None) -> None:
+        """Writes the buffered log messages to the database."""
+        if channel_id is not None:
+            messages = self._pending_logs.pop(str(channel_id), None)
+            pending = {str(channel_id): messages} if messages else {}
+        else:
+            pending, self._pending_logs = self._pending_logs, {}
+
+        if not pending:
+            return
+
+        # Lock is FIFO, so batches of the same channel are written in order
+        async with self._flush_lock:
+            channel_ids = list(pending)
+            unwritten = {}
+            try:
+                if self.separate_log_messages:
+                    unwritten = await self._insert_log_messages(pending)
+                else:
+                    await self.logs.bulk_write(
+                        [
+                            UpdateOne(
+                                {"channel_id": key},
+                                {"$push": {"messages": {"$each": pending[key]}}},
+                            )
+                            for key in channel_ids
+                        ],
+                        ordered=False,
+                    )
+            except Exception as e:
+                failed = pending
+                if isinstance(e, BulkWriteError) and not self.separate_log_messages:
+                    # unordered, only the channels with an error weren't written
+                    failed_ids = {
+                        channel_ids[error["index"]]
+                        for error in e.details.get("writeErrors", [])
+                    }
+                    failed = {key: pending[key] for key in failed_ids}
+                self._requeue_logs(failed)
+                logger.error(
+                    "Failed to write %d log message(s), kept for the next flush.",
+                    sum(len(m) for m in failed.values()),
+                )
+                raise
+
+            for key in channel_ids:
+                if key not in unwritten:
+                    self._missing_logs.pop(key, None)
+            for key, messages in unwritten.items():
+                self._missing_logs[key] += 1
+                if self._missing_logs[key] > self.LOG_LOOKUP_RETRIES:
+                    del self._missing_logs[key]
+                    logger.error(
+                        "No log found for channel %s, dropped %d log message(s).",
+                        key,
+                        len(messages),
+                    )
+                    continue
+                # the log may still be being created, retry with the next flush
+                self._requeue_logs({key: messages})
+                if self._flush_task is None:
+                    self._flush_task = self.bot.loop.create_task(
+                        self._flush_logs_later()
+                    )
+
+    def _requeue_logs(self, pending: dict) -> None:
+        for channel_id, messages in pending.items():
+            # before the messages appended since, to keep the order
+            self._pending_logs[channel_id] = messages + self._pending_logs.get(
+                channel_id, []
+            )
+
+    async def _insert_log_messages(self, pending: dict) -> dict:
+        """
+        Writes buffered messages to `log_messages`.
+
+        Returns
+        -------
+        dict
+            The messages of the channels that have no log yet.
+        """
+        keys = await self._get_log_keys(list(pending))
+        requests = []
+        unwritten = {}
+        for channel_id, messages in pending.items():
+            key = keys.get(channel_id)
+            if key is None:
+                unwritten[channel_id] = messages
+                continue
+            requests += [
+                self._upsert_log_message(key, channel_id, data) for data in messages
+            ]
+        if requests:
+            await self.log_messages.bulk_write(requests, ordered=True)
+        return unwritten
+
+    @staticmethod
+    def _upsert_log_message(key: str, channel_id: str, data: dict) -> UpdateOne:
+        # keyed by log key and message ID, writing a message again is a no-op
+        document = {k: v for k, v in data.items() if k != "message_id"}
+        document["channel_id"] = channel_id
+        return UpdateOne(
+            {"log_key": key, "message_id": data["message_id"]},
+            {"$setOnInsert": document},
+            upsert=True,
+        )
+
+    async def _reassemble_log(self, query: dict) -> bool:
+        """
+        Moves the messages of a log stored in `log_messages` back into the
+        log document, so closed logs keep the format log viewers read.
+
+        Returns
+        -------
+        bool
+            `False` if the log is too large and its messages were kept
+            in `log_messages`.
+        """
+        log = await self.logs.find_one(
+            query, {"key": True, "messages.message_id": True}
+        )
+        if log is None:
+            return True
+
+        messages = (
+            await self.log_messages.find(
+                {"log_key": log["key"]},
+                {"_id": False, "log_key": False, "channel_id": False},
+            )
+            .sort("_id", ASCENDING)
+            .to_list(None)
+        )
+        if not messages:
+            return True
+
+        # skip the messages an interrupted run already moved
+        embedded = {data.get("message_id") for data in log.get("messages", [])}
+        missing = [data for data in messages if data["message_id"] not in embedded]
+        if missing:
+            try:
+                await self.logs.update_one(
+                    {"_id": log["_id"]}, {"$push": {"messages": {"$each": missing}}}
+                )
+            except OperationFailure:
+                # over the document size limit, the messages stay separate
+                logger.warning(
+                    "Log %s is too large, its messages are kept in log_messages.",
+                    log["key"],
+                    exc_info=True,
+                )
+                return False
+        await self.log_messages.delete_many({"log_key": log["key"]})
+        return True
+
+    async def migrate_log_messages(self) -> int:
+        """
+        Moves the embedded messages of the open logs into the `log_messages`
+        collection, and the separate messages of closed logs back into their
+        log document. Safe to run again after it was interrupted.
+
+        Returns
+        -------
+        int
+            The number of migrated logs.
+        """
+        count = 0
+        async for log in self.logs.find(
+            {"open": True, "messages.0": {"$exists": True}},
+            {"key": True, "channel_id": True, "messages": True},
+        ):
+            await self.log_messages.bulk_write(
+                [
+                    self._upsert_log_message(log["key"], log["channel_id"], data)
+                    for data in log["messages"]
+                ],
+                ordered=True,
+            )
+            await self.logs.update_one({"_id": log["_id"]}, {"$set": {"messages": []}})
+            count += 1
+
+        keys = await self.log_messages.distinct("log_key")
+        async for log in self.logs.find(
+            {"open": False, "key": {"$in": keys}}, {"key": True}
+        ):
+            await self._reassemble_log({"_id": log["_id"]})
+            count += 1
+        logger.info("Migrated messages of %d log(s).", count)
+        return count
+
+    async def post_log(
+        self, channel_id: Union[int, str], data: dict, *, projection: dict = None
+    ) -> dict:
+        """
+        Updates the log of a channel.
+
+        Pass a `projection` to limit the returned document to the
+        fields that are needed, long logs carry large message arrays.
+        When a closed log is too large to hold its messages, the returned
+        document has `separate_messages` set.
+        """
+        reassembled = True
+        if data.get("open") is False:
+            if self.separate_log_messages:
+                reassembled = await self._reassemble_log(
+                    {"channel_id": str(channel_id)}
+                )
+            self._forget_log(channel_id)
+        log = await self.logs.find_one_and_update(
+            {"channel_id": str(channel_id)},
+            {"$set": data},
+            projection=projection,
             return_document=True,
         )
+        if log is not None and not reassembled:
+            log["separate_messages"] = True
+        if projection is None:
+            await self._attach_messages([log])
+        elif isinstance(projection.get("messages"), dict):
+            await self._attach_messages([log], limit=projection["messages"]["$slice"])
+        return log
+
+    async def close_logs(self, channel_ids: list, data: dict) -> int:
+        """
+        Updates the open logs of the channels at once.
+
+        Returns
+        -------
+        int
+            The number of updated logs.
+        """
+        result = await self.logs.update_many(
+            {"channel_id": {"$in": [str(c) for c in channel_ids]}, "open": True},
+            {"$set": data},
+        )
+        if data.get("open") is False:
+            if self.separate_log_messages:
+                await asyncio.gather(
+                    *(
+                        self._reassemble_log({"channel_id": str(c)})
+                        for c in channel_ids
+                    )
+                )
+            for channel_id in channel_ids:
+                self._forget_log(channel_id)
+        return result.modified_count
+
+    def _forget_log(self, channel_id: Union[int, str]) -> None:
+        # the channel is closed, no more messages are written to its log
+        self._log_keys.pop(str(channel_id), None)
+        self._missing_logs.pop(str(channel_id), None)
+
+    async def get_closures(self) -> list:
+        return await self.db.closures.find({}, {"_id": False}).to_list(None)
+
+    async def update_closures(self, closures: list, removed: list) -> None:
+        """Upserts the scheduled closures and deletes the removed ones."""
+        requests = [
+            ReplaceOne(
+                {"recipient_id": c["recipient_id"], "auto_close": c["auto_close"]},
+                c,
+                upsert=True,
+            )
+            for c in closures
+        ]
+        requests += [DeleteOne(key) for key in removed]
+        if requests:
+            await self.db.closures.bulk_write(requests, ordered=False)
 
-    async def post_log(self, channel_id: Union[int, str], data: dict) -> dict:
-        return await self.logs.find_one_and_update(
-            {"channel_id": str(channel_id)}, {"$set": data}, return_document=True
+    async def create_message_link(
+        self,
+        thread_message_id: Union[int, str],
+        dm_message_id: Union[int, str],
+        channel_id: Union[int, str],
+    ):
+        await self.db.message_links.insert_one(
+            {
+                "thread_message_id": str(thread_message_id),
+                "dm_message_id": str(dm_message_id),
+                "channel_id": str(channel_id),
+            }
         )
 
+    async def find_message_link(
+        self,
+        *,
+        thread_message_id: Union[int, str] = None,
+        dm_message_id: Union[int, str] = None,
+    ) -> Optional[dict]:
+        if thread_message_id is not None:
+            query = {"thread_message_id": str(thread_message_id)}
+        else:
+            query = {"dm_message_id": str(dm_message_id)}
+        return await self.db.message_links.find_one(query, {"_id": False})
+
+    async def delete_message_links(self, channel_id: Union[int, str]) -> int:
+        """Deletes the message links of a thread channel, once it's closed."""
+        result = await self.db.message_links.delete_many(
+            {"channel_id": str(channel_id)}
+        )
+        return result.deleted_count
+
     async def search_closed_by(self, user_id: Union[int, str]):
-        return await self.logs.find(
+        logs = await self.logs.find(
             {
                 "guild_id": str(self.bot.guild_id),
                 "open": False,
@@ -632,9 +1249,10 @@ class MongoDBClient(ApiClient):
             },
             {"messages": {"$slice": 5}},
         ).to_list(None)
+        return await self._attach_messages(logs, limit=5)
 
     async def search_by_text(self, text: str, limit: Optional[int]):
-        return await self.bot.db.logs.find(
+        logs = await self.bot.db.logs.find(
             {
                 "guild_id": str(self.bot.guild_id),
                 "open": False,
@@ -643,6 +1261,23 @@ class MongoDBClient(ApiClient):
             {"messages": {"$slice": 5}},
         ).to_list(limit)
 
+        if self.separate_log_messages and (limit is None or len(logs) < limit):
+            found = {log["key"] for log in logs}
+            keys = await self.log_messages.distinct(
+                "log_key", {"$text": {"$search": f'"{text}"'}}
+            )
+            keys = [key for key in keys if key not in found]
+            if keys:
+                logs += await self.logs.find(
+                    {
+                        "guild_id": str(self.bot.guild_id),
+                        "open": False,
+                        "key": {"$in": keys},
+                    },
+                    {"messages": {"$slice": 5}},
+                ).to_list(None if limit is None else limit - len(logs))
+        return await self._attach_messages(logs, limit=5)
+
     async def create_note(
         self, recipient: Member, message: Message, message_id: Union[int, str]
     ):
@@ -0,0 +1,334 @@
+import asyncio
+import heapq
+import itertools
+import typing
+from datetime import datetime, timedelta
+
+import discord
+
+from core.models import getLogger
+
+logger = getLogger(__name__)
+
+
+class ScheduledClosure:
+    """
+    A close of a thread due at a set time.
+
+    Stored as `Thread.close_task` or `Thread.auto_close_task`.
+    """
+
+    def __init__(
+        self,
+        scheduler: "ClosureScheduler",
+        recipient_id: int,
+        time: datetime,
+        *,
+        closer: typing.Optional[discord.abc.User] = None,
+        closer_id: int = None,
+        silent: bool = False,
+        delete_channel: bool = True,
+        message: str = None,
+        auto_close: bool = False,
+    ):
+        self.scheduler = scheduler
+        self.recipient_id = recipient_id
+        self.time = time
+        self.closer = closer
+        self.closer_id = closer.id if closer is not None else closer_id
+        self.silent = silent
+        self.delete_channel = delete_channel
+        self.message = message
+        self.auto_close = auto_close
+        self.cancelled = False
+
+    @property
+    def key(self) -> typing.Tuple[int, bool]:
+        return self.recipient_id, self.auto_close
+
+    def cancel(self) -> None:
+        """Cancels the close, does nothing if it already happened."""
+        self.scheduler.cancel(self)
+
+    def to_dict(self) -> dict:
+        return {
+            "recipient_id": str(self.recipient_id),
+            "auto_close": self.auto_close,
+            "time": self.time,
+            "closer_id": self.closer_id,
+            "silent": self.silent,
+            "delete_channel": self.delete_channel,
+            "message": self.message,
+        }
+
+
+class ClosureScheduler:
+    """
+    Schedules thread closes with a single background task.
+
+    The closes are kept in a min-heap by time, cancelled or replaced ones
+    are skipped when they reach the top. Closes scheduled or cancelled
+    by a moderator are persisted to the database right away, auto-close
+    changes are persisted in batches `PERSIST_DELAY` seconds after the
+    first change, so restarting the timer on every message stays in memory.
+
+    Parameters
+    ----------
+    bot : Bot
+        The Modmail bot.
+    """
+
+    # seconds to wait for more auto-close changes before writing them
+    PERSIST_DELAY = 10
+
+    def __init__(self, bot):
+        self.bot = bot
+        self._closures = {}  # (recipient ID, auto close) -> ScheduledClosure
+        self._heap = []  # (time, sequence, ScheduledClosure)
+        self._counter = itertools.count()
+        self._wakeup = asyncio.Event()
+        self._task = None
+        # (recipient ID, auto close) -> ScheduledClosure, or None if removed
+        self._changed = {}
+        self._persist_task = None
+        self._persist_lock = asyncio.Lock()
+
+    def __len__(self):
+        return len(self._closures)
+
+    def get(
+        self, recipient_id: int, auto_close: bool = False
+    ) -> typing.Optional[ScheduledClosure]:
+        return self._closures.get((recipient_id, auto_close))
+
+    def schedule(
+        self,
+        recipient_id: int,
+        after: float,
+        *,
+        closer: discord.abc.User = None,
+        closer_id: int = None,
+        silent: bool = False,
+        delete_channel: bool = True,
+        message: str = None,
+        auto_close: bool = False,
+    ) -> ScheduledClosure:
+        """
+        Schedules a close of the thread of a recipient, replacing
+        the previous close of the same kind.
+
+        Parameters
+        ----------
+        recipient_id : int
+            The ID of the thread recipient.
+        after : float
+            Seconds until the thread is closed.
+        closer : User, optional
+            The user closing the thread.
+        closer_id : int, optional
+            The ID of the closer, when the user isn't available.
+        silent : bool
+            Whether the recipient is notified.
+        delete_channel : bool
+            Whether the thread channel is deleted.
+        message : str, optional
+            The close message.
+        auto_close : bool
+            Whether this is the inactivity auto-close.
+
+        Returns
+        -------
+        ScheduledClosure
+            The scheduled close.
+        """
+        closure = ScheduledClosure(
+            self,
+            recipient_id,
+            datetime.utcnow() + timedelta(seconds=after),
+            closer=closer,
+            closer_id=closer_id,
+            silent=silent,
+            delete_channel=delete_channel,
+            message=message,
+            auto_close=auto_close,
+        )
+        previous = self._closures.get(closure.key)
+        if previous is not None:
+            previous.cancelled = True
+        self._closures[closure.key] = closure
+        self._push(closure)
+        self._changed[closure.key] = closure
+        self._persist(closure)
+        return closure
+
+    def cancel(self, closure: ScheduledClosure) -> None:
+        closure.cancelled = True
+        if self._closures.get(closure.key) is closure:
+            del self._closures[closure.key]
+            self._changed[closure.key] = None
+            self._persist(closure)
+
+    def _push(self, closure: ScheduledClosure) -> None:
+        if len(self._heap) > 2 * len(self._closures) + 64:
+            # too many cancelled entries, drop them
+            self._heap = [entry for entry in self._heap if not entry[2].cancelled]
+            heapq.heapify(self._heap)
+
+        if not self._heap or closure.time < self._heap[0][0]:
+            self._wakeup.set()
+        heapq.heappush(self._heap, (closure.time, next(self._counter), closure))
+
+        if self._task is None or self._task.done():
+            self._task = self.bot.loop.create_task(self._run())
+
+    async def _run(self) -> None:
+        while True:
+            self._wakeup.clear()
+            delay = None
+            while self._heap:
+                time, _, closure = self._heap[0]
+                if closure.cancelled:
+                    heapq.heappop(self._heap)
+                    continue
+                delay = (time - datetime.utcnow()).total_seconds()
+                if delay > 0:
+                    break
+                heapq.heappop(self._heap)
+                delay = None
+                self._fire(closure)
+
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), delay)
+            except asyncio.TimeoutError:
+                pass
+
+    def _fire(self, closure: ScheduledClosure) -> None:
+        self.bot.loop.create_task(self._close(closure))
+
+    async def _close(self, closure: ScheduledClosure) -> None:
+        try:
+            thread = await self.bot.threads.find(recipient_id=closure.recipient_id)
+            if thread is None:
+                logger.debug(
+                    "Failed to close thread for recipient %s.", closure.recipient_id
+                )
+                return
+            closer = closure.closer or self.bot.get_user(closure.closer_id)
+            thread._close_after(
+                closer, closure.silent, closure.delete_channel, closure.message
+            )
+        finally:
+            # the stored record is only removed once the close is underway
+            self.cancel(closure)
+
+    def _persist(self, closure: ScheduledClosure) -> None:
+        if closure.auto_close:
+            self._persist_later()
+        else:
+            # a close set by a moderator must survive a restart
+            self.bot.loop.create_task(self.persist())
+
+    def _persist_later(self) -> None:
+        if self._persist_task is None:
+            self._persist_task = self.bot.loop.create_task(
+                self._persist_after_delay()
+            )
+
+    async def _persist_after_delay(self) -> None:
+        try:
+            await asyncio.sleep(self.PERSIST_DELAY)
+        finally:
+            self._persist_task = None
+        await self.persist()
+
+    async def persist(self) -> None:
+        """Writes the changed closures to the database."""
+        async with self._persist_lock:
+            changed, self._changed = self._changed, {}
+            if not changed:
+                return
+
+            try:
+                await self.bot.api.update_closures(
+                    [c.to_dict() for c in changed.values() if c is not None],
+                    [
+                        {"recipient_id": str(recipient_id), "auto_close": auto_close}
+                        for (recipient_id, auto_close), c in changed.items()
+                        if c is None
+                    ],
+                )
+            except Exception:
+                logger.error(
+                    "Failed to write %d closure(s), kept for the next write.",
+                    len(changed),
+                    exc_info=True,
+                )
+                # the changes made during the write are newer
+                self._changed = {**changed, **self._changed}
+
+    async def recover(self) -> None:
+        """Reschedules the closures stored in the database, after a restart."""
+        items = await self.bot.api.get_closures()
+
+        # backwards compat, closures used to be stored in the config
+        legacy = self.bot.config["closures"]
+        for recipient_id, data in legacy.items():
+            items.append(
+                {
+                    "recipient_id": recipient_id,
+                    "auto_close": data.get("auto_close", False),
+                    "time": datetime.fromisoformat(data["time"]),
+                    "closer_id": data["closer_id"],
+                    "silent": data["silent"],
+                    "delete_channel": data["delete_channel"],
+                    "message": data["message"],
+                }
+            )
+
+        logger.info("There are %d thread(s) pending to be closed.", len(items))
+        logger.line()
+
+        threads = await asyncio.gather(
+            *(self.bot.threads.find(recipient_id=int(i["recipient_id"])) for i in items)
+        )
+        now = datetime.utcnow()
+        for data, thread in zip(items, threads):
+            recipient_id = int(data["recipient_id"])
+            auto_close = data.get("auto_close", False)
+            if thread is None:
+                # If the channel is deleted
+                logger.debug("Failed to close thread for recipient %s.", recipient_id)
+                self._changed[(recipient_id, auto_close)] = None
+                continue
+
+            after = max((data["time"] - now).total_seconds(), 0)
+            logger.debug(
+                "Thread for recipient %s will be closed after %s seconds.",
+                recipient_id,
+                after,
+            )
+            closure = self.schedule(
+                recipient_id,
+                after,
+                closer=self.bot.get_user(data["closer_id"]),
+                closer_id=data["closer_id"],
+                silent=data["silent"],
+                delete_channel=data["delete_channel"],
+                message=data["message"],
+                auto_close=auto_close,
+            )
+            if auto_close:
+                thread.auto_close_task = closure
+            else:
+                thread.close_task = closure
+
+        await self.persist()
+        if legacy:
+            self.bot.config.remove("closures")
+            await self.bot.config.update()
+
+    async def close(self) -> None:
+        """Stops the scheduler and writes the pending changes."""
+        if self._task is not None:
+            self._task.cancel()
+        await self.persist()
@@ -51,6 +51,7 @@ class ConfigManager:
         "blocked_emoji": "\N{NO ENTRY SIGN}",
         "close_emoji": "\N{LOCK}",
         "use_user_id_channel_name": False,
+        "thread_channel_pool_size": 0,
         "recipient_thread_close": False,
         "thread_auto_close_silently": False,
         "thread_auto_close": isodate.Duration(),
@@ -149,6 +150,7 @@ class ConfigManager:
         "disable_updates": False,
         # Logging
         "log_level": "INFO",
+        "separate_log_messages": False,
         # data collection
         "data_collection": False,
     }
@@ -183,6 +185,7 @@ class ConfigManager:
         "update_notifications",
         "thread_contact_silently",
         "anonymous_snippets",
+        "separate_log_messages",
     }
 
     enums = {
@@ -193,12 +196,44 @@ class ConfigManager:
 
     force_str = {"command_permissions", "level_permissions"}
 
+    # keys whose decoded values are memoized by `get`
+    decoded_keys = {*colors, *time_deltas, *booleans, *enums, *force_str}
+
+    # keys that change how emojis are resolved by `bot.convert_emoji`
+    emoji_keys = {"sent_emoji", "blocked_emoji", "close_emoji", "modmail_guild_id"}
+
+    # keys that are part of the embed templates of `bot.embed_templates`
+    embed_keys = {
+        *colors,
+        "show_timestamp",
+        "mod_tag",
+        "anon_username",
+        "anon_avatar_url",
+        "anon_tag",
+        "thread_close_title",
+        "thread_close_footer",
+        "disabled_new_thread_title",
+        "disabled_new_thread_response",
+        "disabled_new_thread_footer",
+        "disabled_current_thread_title",
+        "disabled_current_thread_response",
+        "disabled_current_thread_footer",
+        "modmail_guild_id",
+    }
+
     defaults = {**public_keys, **private_keys, **protected_keys}
     all_keys = set(defaults.keys())
 
+    # seconds to wait for more changes before writing the config
+    UPDATE_DEBOUNCE = 0.05
+
     def __init__(self, bot):
         self.bot = bot
         self._cache = {}
+        self._decoded = {}
+        self._persisted = None  # the config as last stored in the database
+        self._update_task = None
+        self._update_lock = asyncio.Lock()
         self.ready_event = asyncio.Event()
         self.config_help = {}
 
@@ -232,6 +267,7 @@ class ConfigManager:
                         "Failed to load config.json env values.", exc_info=True
                     )
         self._cache = data
+        self._decoded.clear()
 
         config_help_json = os.path.join(
             os.path.dirname(os.path.abspath(__file__)), "config_help.json"
@@ -242,15 +278,53 @@ class ConfigManager:
         return self._cache
 
     async def update(self):
-        """Updates the config with data from the cache"""
-        await self.bot.api.update_config(self.filter_default(self._cache))
+        """
+        Updates the config with data from the cache.
+
+        Only the keys that changed since the last write are sent,
+        concurrent calls are coalesced into a single write.
+        """
+        if self._update_task is None:
+            self._update_task = self.bot.loop.create_task(self._update())
+        await asyncio.shield(self._update_task)
+
+    async def _update(self):
+        await asyncio.sleep(self.UPDATE_DEBOUNCE)
+        async with self._update_lock:
+            # calls from now on need another write
+            self._update_task = None
+            # a snapshot, the cache may be changed in place during the write
+            data = deepcopy(self.filter_valid(self.filter_default(self._cache)))
+
+            if self._persisted is None:
+                await self.bot.api.update_config(data)
+                self._persisted = data
+                return
+
+            toset = {
+                k: v for k, v in data.items() if self._persisted.get(k, Default) != v
+            }
+            unset = [k for k in self._persisted if k not in data]
+            if not toset and not unset:
+                return
+
+            logger.debug("Updating config keys: %s.", ", ".join([*toset, *unset]))
+            await self.bot.api.patch_config(toset, unset)
+            for k in unset:
+                del self._persisted[k]
+            self._persisted.update(toset)
 
     async def refresh(self) -> dict:
         """Refreshes internal cache with data from database"""
-        for k, v in (await self.bot.api.get_config()).items():
+        data = await self.bot.api.get_config()
+        for k, v in data.items():
             k = k.lower()
             if k in self.all_keys:
                 self._cache[k] = v
+        self._persisted = deepcopy(self.filter_valid(data))
+        self._decoded.clear()
+        self.bot.clear_emoji_cache()
+        self.bot.embed_templates.invalidate()
         if not self.ready_event.is_set():
             self.ready_event.set()
             logger.debug("Successfully fetched configurations from database.")
@@ -265,6 +339,14 @@ class ConfigManager:
         if key not in self.all_keys:
             raise InvalidConfigError(f'Configuration "{key}" is invalid.')
         self._cache[key] = item
+        self._invalidate(key)
+
+    def _invalidate(self, key: str) -> None:
+        self._decoded.pop(key, None)
+        if key in self.emoji_keys:
+            self.bot.clear_emoji_cache()
+        if key in self.embed_keys:
+            self.bot.embed_templates.invalidate()
 
     def __getitem__(self, key: str) -> typing.Any:
         # make use of the custom methods in func:get:
@@ -284,6 +366,17 @@ class ConfigManager:
         if not convert:
             return value
 
+        try:
+            return self._decoded[key]
+        except KeyError:
+            pass
+
+        value = self._convert(key, value)
+        if key in self.decoded_keys:
+            self._decoded[key] = value
+        return value
+
+    def _convert(self, key: str, value: typing.Any) -> typing.Any:
         if key in self.colors:
             try:
                 return int(value.lstrip("#"), base=16)
@@ -337,11 +430,28 @@ class ConfigManager:
             if changed:
                 # transition the database as well
                 self.set(key, new_value)
-
-            value = new_value
+                value = new_value
 
         return value
 
+    def get_color(self, key: str) -> int:
+        """Returns the decoded value of a colour configuration."""
+        if key.lower() not in self.colors:
+            raise InvalidConfigError(f'Configuration "{key}" is not a colour.')
+        return self.get(key)
+
+    def get_bool(self, key: str) -> bool:
+        """Returns the decoded value of a yes/no configuration."""
+        if key.lower() not in self.booleans:
+            raise InvalidConfigError(f'Configuration "{key}" is not a yes/no value.')
+        return bool(self.get(key))
+
+    def get_duration(self, key: str) -> isodate.Duration:
+        """Returns the decoded value of a duration configuration."""
+        if key.lower() not in self.time_deltas:
+            raise InvalidConfigError(f'Configuration "{key}" is not a duration.')
+        return self.get(key)
+
     def set(self, key: str, item: typing.Any, convert=True) -> None:
         if not convert:
             return self.__setitem__(key, item)
@@ -411,6 +521,7 @@ class ConfigManager:
             raise InvalidConfigError(f'Configuration "{key}" is invalid.')
         if key in self._cache:
             del self._cache[key]
+        self._invalidate(key)
         self._cache[key] = deepcopy(self.defaults[key])
         return self._cache[key]
 
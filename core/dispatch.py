@@ -0,0 +1,133 @@
+import typing
+
+from discord.ext.commands.view import StringView
+
+from core.models import Default, getLogger
+from core.utils import parse_alias
+
+logger = getLogger(__name__)
+
+
+class DispatchTable:
+    """
+    Pre-parsed aliases and snippets.
+
+    Aliases are split into their commands once when they change instead of
+    on every invocation. The table is rebuilt when `aliases` or `snippets`
+    is replaced or after `invalidate` is called.
+
+    Parameters
+    ----------
+    bot : Bot
+        The Modmail bot.
+    """
+
+    def __init__(self, bot):
+        self.bot = bot
+        self._valid = False
+        self._sources = (None, None)
+        self._aliases = {}
+        self._snippets = {}
+
+    def invalidate(self) -> None:
+        """Marks the aliases and snippets as changed, the table is rebuilt lazily."""
+        self._valid = False
+
+    def _sync(self) -> None:
+        sources = (self.bot.aliases, self.bot.snippets)
+        if self._valid and all(a is b for a, b in zip(sources, self._sources)):
+            return
+
+        aliases, snippets = sources
+        self._aliases = {
+            name: tuple(parse_alias(alias)) for name, alias in aliases.items()
+        }
+        self._snippets = dict(snippets)
+        self._sources = sources
+        self._valid = True
+
+    def get_alias(
+        self, name: str, arguments: str = ""
+    ) -> typing.Optional[typing.List[str]]:
+        """
+        Gets the commands an alias runs.
+
+        Parameters
+        ----------
+        name : str
+            The name of the alias.
+        arguments : str, optional
+            The text after the alias name, appended to the first command.
+
+        Returns
+        -------
+        Optional[List[str]]
+            The commands of the alias, empty if the alias is invalid.
+            `None` if there's no such alias.
+        """
+        self._sync()
+        commands = self._aliases.get(name)
+        if commands is None:
+            return None
+
+        commands = list(commands)
+        if commands and arguments.strip():
+            content = parse_alias(arguments, split=False)
+            if content and content[0]:
+                commands[0] = f"{commands[0]} {content[0]}"
+        return commands
+
+    def get_snippet(self, name: str) -> typing.Optional[str]:
+        """Gets the content of a snippet, `None` if there's no such snippet."""
+        self._sync()
+        return self._snippets.get(name)
+
+
+class MessageContext:
+    """
+    What a message resolves to, looked up once per message.
+
+    The handlers of a message share one of these, so the prefix is parsed,
+    the thread of the channel is found and the invocation contexts are
+    built only once however many of them need it.
+
+    Attributes
+    ----------
+    message : discord.Message
+        The message.
+    prefix : Optional[str]
+        The prefix the message was invoked with, `None` if it wasn't.
+    invoker : Optional[str]
+        The lowercased command or alias name after the prefix.
+    view : StringView
+        The content of the message, past the invoked name if any.
+    thread : Optional[Thread]
+        The thread of the channel, `Default` until it's looked up.
+    ctxs : Optional[List[commands.Context]]
+        The invocation contexts, `None` until they're built.
+    """
+
+    __slots__ = ("message", "prefix", "invoker", "view", "thread", "ctxs")
+
+    def __init__(self, message, *, thread=Default):
+        self.message = message
+        self.prefix = None
+        self.invoker = None
+        self.view = StringView(message.content)
+        self.thread = thread
+        self.ctxs = None
+
+    def parse(self, prefixes: typing.Iterable[str]) -> None:
+        """Finds the prefix and the invoked name, the first match wins."""
+        for prefix in prefixes:
+            if self.view.skip_string(prefix):
+                self.prefix = prefix
+                self.invoker = self.view.get_word().lower()
+                return
+
+    @property
+    def arguments(self) -> str:
+        """The text after the invoked name."""
+        if self.invoker is None:
+            return ""
+        return self.message.content[len(f"{self.prefix}{self.invoker}") :]
@@ -0,0 +1,171 @@
+import copy
+import typing
+
+import discord
+
+from core.models import getLogger
+
+logger = getLogger(__name__)
+
+
+class EmbedTemplates:
+    """
+    Pre-built embeds for the messages relayed by threads.
+
+    The colours, footers and titles read from the config are set once per
+    kind of message, every send gets a shallow copy of the template and
+    only fills in what depends on the message. The templates are rebuilt
+    when the guild icon changes or after `invalidate` is called.
+
+    Kinds
+    -----
+    recipient_message
+        A message from the recipient, in the thread channel.
+    mod_reply
+        A reply from a moderator, footer set when `mod_tag` is.
+    anonymous_reply
+        An anonymous reply, as sent to the recipient.
+    anonymous_thread_reply
+        An anonymous reply, as shown in the thread channel.
+    note
+        A note, in the thread channel.
+    close_notice
+        The thread closed message, without description.
+    disabled_new_thread
+        The response to a new thread while Modmail is disabled.
+    disabled_current_thread
+        The response to a message while Modmail is disabled.
+
+    Parameters
+    ----------
+    bot : Bot
+        The Modmail bot.
+    """
+
+    def __init__(self, bot):
+        self.bot = bot
+        self._valid = False
+        self._sources = (None, None)
+        self._templates = {}
+        self._show_timestamp = False
+        self._mod_tag = None
+        self._anon_author = (None, None)
+
+    def invalidate(self) -> None:
+        """Marks the config as changed, the templates are rebuilt lazily."""
+        self._valid = False
+
+    def _sync(self) -> None:
+        guild = self.bot.guild
+        sources = (guild, guild.icon if guild is not None else None)
+        if self._valid and all(a is b for a, b in zip(sources, self._sources)):
+            return
+
+        config = self.bot.config
+        guild_icon_url = guild.icon_url if guild is not None else discord.Embed.Empty
+
+        self._show_timestamp = config["show_timestamp"]
+        self._mod_tag = config["mod_tag"]
+        anon_name = config["anon_username"]
+        if anon_name is None:
+            anon_name = self._mod_tag
+        anon_avatar_url = config["anon_avatar_url"]
+        if anon_avatar_url is None:
+            anon_avatar_url = guild_icon_url
+        self._anon_author = (anon_name, anon_avatar_url)
+
+        recipient_message = discord.Embed(color=self.bot.recipient_color)
+
+        mod_reply = discord.Embed(color=self.bot.mod_color)
+        if self._mod_tag is not None:
+            mod_reply.set_footer(text=self._mod_tag)
+
+        anonymous_reply = discord.Embed(color=self.bot.mod_color)
+        anonymous_reply.set_footer(text=config["anon_tag"])
+
+        anonymous_thread_reply = discord.Embed(color=self.bot.mod_color)
+        anonymous_thread_reply.set_footer(text="Anonymous Reply")
+
+        note = discord.Embed(color=self.bot.main_color)
+
+        close_notice = discord.Embed(
+            title=config["thread_close_title"], color=self.bot.error_color
+        )
+        close_notice.set_footer(
+            text=config["thread_close_footer"], icon_url=guild_icon_url
+        )
+
+        disabled_new_thread = discord.Embed(
+            title=config["disabled_new_thread_title"],
+            color=self.bot.error_color,
+            description=config["disabled_new_thread_response"],
+        )
+        disabled_new_thread.set_footer(
+            text=config["disabled_new_thread_footer"], icon_url=guild_icon_url
+        )
+
+        disabled_current_thread = discord.Embed(
+            title=config["disabled_current_thread_title"],
+            color=self.bot.error_color,
+            description=config["disabled_current_thread_response"],
+        )
+        disabled_current_thread.set_footer(
+            text=config["disabled_current_thread_footer"], icon_url=guild_icon_url
+        )
+
+        self._templates = {
+            "recipient_message": recipient_message,
+            "mod_reply": mod_reply,
+            "anonymous_reply": anonymous_reply,
+            "anonymous_thread_reply": anonymous_thread_reply,
+            "note": note,
+            "close_notice": close_notice,
+            "disabled_new_thread": disabled_new_thread,
+            "disabled_current_thread": disabled_current_thread,
+        }
+        self._sources = sources
+        self._valid = True
+        logger.debug("Rebuilt the embed templates.")
+
+    @property
+    def show_timestamp(self) -> bool:
+        """Whether the embeds show when the message was sent."""
+        self._sync()
+        return self._show_timestamp
+
+    @property
+    def mod_tag(self) -> typing.Optional[str]:
+        """The footer of moderator replies, `None` to use their top role."""
+        self._sync()
+        return self._mod_tag
+
+    @property
+    def anon_author(self) -> typing.Tuple[typing.Optional[str], str]:
+        """
+        The name and avatar URL of anonymous replies,
+        the name is `None` to use the top role of the moderator.
+        """
+        self._sync()
+        return self._anon_author
+
+    def get(self, kind: str) -> discord.Embed:
+        """
+        Gets a new embed from a template.
+
+        Parameters
+        ----------
+        kind : str
+            The kind of message, see the class documentation.
+
+        Returns
+        -------
+        discord.Embed
+            A copy of the template, safe to modify.
+        """
+        self._sync()
+        embed = copy.copy(self._templates[kind])
+        # `add_field` appends in place, the other setters replace their dict
+        fields = getattr(embed, "_fields", None)
+        if fields is not None:
+            embed._fields = [dict(field) for field in fields]
+        return embed
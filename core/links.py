@@ -0,0 +1,78 @@
+import functools
+import re
+import typing
+from urllib import parse
+
+__all__ = ["URL_REGEX", "find_urls", "classify_url", "image_url", "find_image_urls"]
+
+URL_REGEX = re.compile(
+    r"http[s]?:\/\/(?:[a-zA-Z]|[0-9]|[$-_@.&+]|[!*(),]|(?:%[0-9a-fA-F][0-9a-fA-F]))+"
+)
+GYAZO_REGEX = re.compile(
+    r"(http[s]?:\/\/)((?:[a-zA-Z]|[0-9]|[$-_@.&+]|[!*(),]|(?:%[0-9a-fA-F][0-9a-fA-F]))+)"
+)
+IMAGE_EXTENSIONS = (".png", ".jpg", ".gif", ".jpeg", ".webp")
+
+
+def find_urls(content: str) -> typing.List[str]:
+    """Finds all of the URLs in a message content."""
+    return URL_REGEX.findall(content)
+
+
+@functools.lru_cache(maxsize=1024)
+def classify_url(url: str) -> typing.Tuple[str, str]:
+    """
+    Parses a URL once and checks if it's pointing to an image.
+
+    Parameters
+    ----------
+    url : str
+        The URL to check.
+
+    Returns
+    -------
+    Tuple[str, str]
+        The image URL and the image URL sized as a Discord avatar,
+        both '' if the URL isn't pointing to an image.
+    """
+    if url.startswith("https://gyazo.com") or url.startswith("http://gyazo.com"):
+        # gyazo support
+        url = GYAZO_REGEX.sub(r"\1i.\2.png", url)
+
+    parts = parse.urlsplit(url)
+    if not parts.path.lower().endswith(IMAGE_EXTENSIONS):
+        return "", ""
+    return (
+        parse.urlunsplit(parts),
+        parse.urlunsplit((*parts[:3], "size=128", parts[-1])),
+    )
+
+
+def image_url(url: str, *, convert_size: bool = True) -> str:
+    """
+    Check if the URL is pointing to an image.
+
+    Parameters
+    ----------
+    url : str
+        The URL to check.
+    convert_size : bool
+        Whether to size the image as a Discord avatar.
+
+    Returns
+    -------
+    str
+        The image URL, or '' if the URL isn't pointing to an image.
+    """
+    plain, sized = classify_url(url)
+    return sized if convert_size else plain
+
+
+def find_image_urls(content: str) -> typing.List[str]:
+    """Finds the URLs in a message content that are pointing to images."""
+    urls = []
+    for url in URL_REGEX.findall(content):
+        plain, _ = classify_url(url)
+        if plain:
+            urls.append(plain)
+    return urls
@@ -0,0 +1,179 @@
+import asyncio
+import typing
+from collections import deque
+from enum import IntEnum
+
+from core.models import getLogger
+
+logger = getLogger(__name__)
+
+
+class Lane(IntEnum):
+    """Priority of an outbound request, lower goes first."""
+
+    DELIVERY = 0
+    LOGGING = 1
+    COSMETIC = 2
+
+
+class _Action:
+    __slots__ = ("coro", "future", "key", "queued_at")
+
+    def __init__(self, coro, future, key, queued_at):
+        self.coro = coro
+        self.future = future
+        self.key = key
+        self.queued_at = queued_at
+
+
+class OutboundQueue:
+    """
+    Runs outbound Discord requests by priority.
+
+    Delivery requests always start right away. Logging and cosmetic
+    requests share `MAX_CONCURRENCY` slots, logging first, and cosmetic
+    requests wait while deliveries are in flight so they don't take
+    rate limits from user visible messages. A cosmetic request that has
+    waited `MAX_WAIT` seconds runs anyway, so a steady stream of
+    deliveries can't hold it back forever.
+
+    Requests with a `key` are coalesced while one with the same key is
+    queued, droppable requests are dropped once `MAX_DROPPABLE` requests
+    are queued in their lane.
+
+    Parameters
+    ----------
+    bot : Bot
+        The Modmail bot.
+    """
+
+    MAX_CONCURRENCY = 4
+    MAX_DROPPABLE = 50
+    # seconds a cosmetic request waits for deliveries at most
+    MAX_WAIT = 5
+
+    def __init__(self, bot):
+        self.bot = bot
+        self._queues = {lane: deque() for lane in Lane}
+        self._keys = {}  # key -> queued _Action
+        self._running = {lane: 0 for lane in Lane}
+        self._aging = None  # handle of the next check of the cosmetic lane
+        self._counts = {
+            lane: {"done": 0, "failed": 0, "coalesced": 0, "dropped": 0}
+            for lane in Lane
+        }
+
+    @property
+    def metrics(self) -> typing.Dict[str, typing.Dict[str, int]]:
+        """The queue depth, running and finished requests of every lane."""
+        return {
+            lane.name.lower(): {
+                "queued": len(self._queues[lane]),
+                "running": self._running[lane],
+                **self._counts[lane],
+            }
+            for lane in Lane
+        }
+
+    def submit(
+        self,
+        coro: typing.Awaitable,
+        lane: Lane = Lane.COSMETIC,
+        *,
+        key: typing.Hashable = None,
+        droppable: bool = False,
+    ) -> asyncio.Future:
+        """
+        Queues a request.
+
+        Parameters
+        ----------
+        coro : Awaitable
+            The request, not awaited yet.
+        lane : Lane
+            The priority of the request.
+        key : Hashable, optional
+            Requests with the same key are coalesced while queued.
+        droppable : bool
+            Whether the request may be dropped when the lane is full.
+
+        Returns
+        -------
+        asyncio.Future
+            Resolves to the result of the request, or `None`
+            if it was dropped.
+        """
+        loop = self.bot.loop
+        if key is not None and key in self._keys:
+            self._counts[lane]["coalesced"] += 1
+            coro.close()
+            return self._keys[key].future
+
+        future = loop.create_future()
+        # awaiting the future is optional
+        future.add_done_callback(lambda f: f.cancelled() or f.exception())
+
+        if droppable and len(self._queues[lane]) >= self.MAX_DROPPABLE:
+            self._counts[lane]["dropped"] += 1
+            coro.close()
+            future.set_result(None)
+            return future
+
+        action = _Action(coro, future, key, loop.time())
+        if key is not None:
+            self._keys[key] = action
+        self._queues[lane].append(action)
+        self._dispatch()
+        return future
+
+    def _dispatch(self) -> None:
+        queue = self._queues[Lane.DELIVERY]
+        while queue:
+            self._start(Lane.DELIVERY, queue.popleft())
+
+        for lane in (Lane.LOGGING, Lane.COSMETIC):
+            queue = self._queues[lane]
+            while queue:
+                if self._running[Lane.LOGGING] + self._running[Lane.COSMETIC] >= (
+                    self.MAX_CONCURRENCY
+                ):
+                    return
+                if lane is Lane.COSMETIC and self._running[Lane.DELIVERY]:
+                    wait = queue[0].queued_at + self.MAX_WAIT - self.bot.loop.time()
+                    if wait > 0:
+                        self._dispatch_after(wait)
+                        return
+                self._start(lane, queue.popleft())
+
+    def _dispatch_after(self, delay: float) -> None:
+        if self._aging is None:
+            self._aging = self.bot.loop.call_later(delay, self._aged)
+
+    def _aged(self) -> None:
+        self._aging = None
+        self._dispatch()
+
+    def _start(self, lane: Lane, action: _Action) -> None:
+        if action.key is not None:
+            self._keys.pop(action.key, None)
+        self._running[lane] += 1
+        self.bot.loop.create_task(self._execute(lane, action))
+
+    async def _execute(self, lane: Lane, action: _Action) -> None:
+        try:
+            result = await action.coro
+        except asyncio.CancelledError:
+            action.future.cancel()
+            raise
+        except Exception as e:
+            self._counts[lane]["failed"] += 1
+            logger.debug("Outbound %s request failed: %s.", lane.name.lower(), e)
+            if not action.future.done():
+                action.future.set_exception(e)
+        else:
+            self._counts[lane]["done"] += 1
+            if not action.future.done():
+                action.future.set_result(result)
+        finally:
+            self._running[lane] -= 1
+            self._dispatch()
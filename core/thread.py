@@ -1,9 +1,10 @@
 import asyncio
 import copy
-import io
 import re
+import tempfile
 import time
 import typing
+from collections import Counter
 from datetime import datetime, timedelta
 from types import SimpleNamespace
 
@@ -12,7 +13,9 @@ import isodate
 import discord
 from discord.ext.commands import MissingRequiredArgument, CommandError
 
+from core.links import find_image_urls
 from core.models import DMDisabled, DummyMessage, getLogger
+from core.outbound import Lane
 from core.time import human_timedelta
 from core.utils import (
     is_image_url,
@@ -29,6 +32,15 @@ logger = getLogger(__name__)
 class Thread:
     """Represents a discord Modmail thread"""
 
+    # bytes, larger attachments are linked instead of uploaded in plain replies
+    ATTACHMENT_SIZE_LIMIT = 8 * 1024 * 1024
+    # bytes, larger attachments are downloaded to a temporary file
+    ATTACHMENT_SPOOL_SIZE = 1024 * 1024
+    # seconds a typing indicator lasts, Discord shows it for 10 seconds
+    TYPING_WINDOW = 9
+    # seconds the blocked state of the recipient is reused when relaying typing
+    BLOCKED_TTL = 60
+
     def __init__(
         self,
         manager: "ThreadManager",
@@ -52,6 +64,12 @@ class Thread:
         self.close_task = None
         self.auto_close_task = None
         self._cancelled = False
+        # thread channel message ID <-> DM message ID
+        self._linked_messages = {}
+        self._linked_dm_messages = {}
+        # from recipient -> when typing was last relayed
+        self._typing_relayed = {True: 0.0, False: 0.0}
+        self._blocked_state = None  # (checked at, blocked)
 
     def __repr__(self):
         return f'Thread(recipient="{self.recipient or self.id}", channel={self.channel.id})'
@@ -105,9 +123,9 @@ class Thread:
             for i in self.wait_tasks:
                 i.cancel()
 
-    async def setup(self, *, creator=None, category=None, initial_message=None):
-        """Create the thread channel and other io related initialisation tasks"""
-        self.bot.dispatch("thread_initiate", self, creator, category, initial_message)
+    async def _create_channel(
+        self, category: typing.Optional[discord.CategoryChannel], topic: str
+    ) -> typing.Optional[discord.TextChannel]:
         recipient = self.recipient
 
         # in case it creates a channel outside of category
@@ -117,43 +135,75 @@ class Thread:
             )
         }
 
-        category = category or self.bot.main_category
-
         if category is not None:
             overwrites = None
 
         try:
-            channel = await self.bot.modmail_guild.create_text_channel(
+            self.manager.count_request("setup", "create_channel")
+            return await self.bot.modmail_guild.create_text_channel(
                 name=format_channel_name(self.bot, recipient),
                 category=category,
                 overwrites=overwrites,
+                topic=topic,
                 reason="Creating a thread channel.",
             )
         except discord.HTTPException:
-            # try again but null-discrim (name could be banned)
-            try:
-                channel = await self.bot.modmail_guild.create_text_channel(
-                    name=format_channel_name(self.bot, recipient, force_null=True),
-                    category=category,
-                    overwrites=overwrites,
-                    reason="Creating a thread channel.",
-                )
-            except discord.HTTPException as e:  # Failed to create due to missing perms.
-                logger.critical(
-                    "An error occurred while creating a thread.", exc_info=True
+            pass
+
+        # try again but null-discrim (name could be banned)
+        try:
+            self.manager.count_request("setup", "create_channel")
+            return await self.bot.modmail_guild.create_text_channel(
+                name=format_channel_name(self.bot, recipient, force_null=True),
+                category=category,
+                overwrites=overwrites,
+                topic=topic,
+                reason="Creating a thread channel.",
+            )
+        except discord.HTTPException as e:  # Failed to create due to missing perms.
+            logger.critical("An error occurred while creating a thread.", exc_info=True)
+            self.manager.pop(self.id)
+
+            embed = discord.Embed(color=self.bot.error_color)
+            embed.title = "Error while trying to create a thread."
+            embed.description = str(e)
+            embed.add_field(name="Recipient", value=recipient.mention)
+
+            if self.bot.log_channel is not None:
+                self.bot.outbound.submit(
+                    self.bot.log_channel.send(embed=embed), Lane.LOGGING
                 )
-                self.manager.cache.pop(self.id)
+            return None
+
+    async def setup(self, *, creator=None, category=None, initial_message=None):
+        """Create the thread channel and other io related initialisation tasks"""
+        recipient = self.recipient
+        topic = f"User ID: {recipient.id}"
 
-                embed = discord.Embed(color=self.bot.error_color)
-                embed.title = "Error while trying to create a thread."
-                embed.description = str(e)
-                embed.add_field(name="Recipient", value=recipient.mention)
+        # reveal a pre-created channel when the pool is enabled
+        channel = None
+        if category is None:
+            channel = await self.bot.channel_pool.claim(
+                format_channel_name(self.bot, recipient), topic
+            )
+        if channel is not None:
+            self.manager.count_request("setup", "claim_channel")
+            category = channel.category
+        else:
+            category = await self.bot.category_pool.acquire(category)
+        self.bot.dispatch("thread_initiate", self, creator, category, initial_message)
 
-                if self.bot.log_channel is not None:
-                    await self.bot.log_channel.send(embed=embed)
+        if channel is None:
+            try:
+                channel = await self._create_channel(category, topic)
+            finally:
+                self.bot.category_pool.release(category, channel)
+            if channel is None:
                 return
 
         self._channel = channel
+        self.manager.register(self)
+        self.manager.index_channel(channel, recipient.id)
 
         try:
             log_url, log_data = await asyncio.gather(
@@ -169,7 +219,6 @@ class Thread:
             log_url = log_count = None
             # ensure core functionality still works
 
-        await channel.edit(topic=f"User ID: {recipient.id}")
         self.ready = True
 
         if creator is not None and creator != recipient:
@@ -182,8 +231,10 @@ class Thread:
                 recipient, log_url, log_count, self.bot.main_color
             )
             try:
+                self.manager.count_request("setup", "genesis_message")
                 msg = await channel.send(mention, embed=info_embed)
-                self.bot.loop.create_task(msg.pin())
+                self.manager.count_request("setup", "pin")
+                self.bot.outbound.submit(msg.pin(), Lane.COSMETIC)
                 self.genesis_message = msg
             except Exception:
                 logger.error("Failed unexpectedly:", exc_info=True)
@@ -209,12 +260,16 @@ class Thread:
             embed.title = self.bot.config["thread_creation_title"]
 
             if creator is None or creator == recipient:
+                self.manager.count_request("setup", "recipient_message")
                 msg = await recipient.send(embed=embed)
 
                 if recipient_thread_close:
                     close_emoji = self.bot.config["close_emoji"]
                     close_emoji = await self.bot.convert_emoji(close_emoji)
-                    await self.bot.add_reaction(msg, close_emoji)
+                    self.manager.count_request("setup", "reaction")
+                    self.bot.outbound.submit(
+                        self.bot.add_reaction(msg, close_emoji), Lane.COSMETIC
+                    )
 
         async def send_persistent_notes():
             notes = await self.bot.api.find_notes(self.recipient)
@@ -246,6 +301,7 @@ class Thread:
                     "author": Author(),
                 }
                 message = discord.Message(state=State(), channel=None, data=data)
+                self.manager.count_request("setup", "persistent_note")
                 ids[note["_id"]] = str(
                     (await self.note(message, persistent=True, thread_creation=True)).id
                 )
@@ -256,7 +312,9 @@ class Thread:
             if initial_message:
                 message = DummyMessage(copy.copy(initial_message))
                 try:
-                    return await self.bot.trigger_auto_triggers(message, channel)
+                    return await self.bot.trigger_auto_triggers(
+                        message, channel, thread=self
+                    )
                 except RuntimeError:
                     pass
 
@@ -367,23 +425,14 @@ class Thread:
         await self.cancel_closure(auto_close)
 
         if after > 0:
-            # TODO: Add somewhere to clean up broken closures
-            #  (when channel is already deleted)
-            now = datetime.utcnow()
-            items = {
-                # 'initiation_time': now.isoformat(),
-                "time": (now + timedelta(seconds=after)).isoformat(),
-                "closer_id": closer.id,
-                "silent": silent,
-                "delete_channel": delete_channel,
-                "message": message,
-                "auto_close": auto_close,
-            }
-            self.bot.config["closures"][str(self.id)] = items
-            await self.bot.config.update()
-
-            task = self.bot.loop.call_later(
-                after, self._close_after, closer, silent, delete_channel, message
+            task = self.bot.closure_scheduler.schedule(
+                self.id,
+                after,
+                closer=closer,
+                silent=silent,
+                delete_channel=delete_channel,
+                message=message,
+                auto_close=auto_close,
             )
 
             if auto_close:
@@ -397,7 +446,7 @@ class Thread:
         self, closer, silent=False, delete_channel=True, message=None, scheduled=False
     ):
         try:
-            self.manager.cache.pop(self.id)
+            self.manager.pop(self.id)
         except KeyError as e:
             logger.error("Thread already closed: %s.", e)
             return
@@ -411,6 +460,12 @@ class Thread:
 
         # Logging
         if self.channel:
+            self.bot.loop.create_task(self._delete_message_links())
+            try:
+                await self.bot.api.flush_logs(self.channel.id)
+            except Exception:
+                # the messages stay buffered, the thread is closed regardless
+                logger.error("Failed to write the thread log messages.", exc_info=True)
             log_data = await self.bot.api.post_log(
                 self.channel.id,
                 {
@@ -427,6 +482,7 @@ class Thread:
                         "mod": True,
                     },
                 },
+                projection={"key": True, "title": True, "messages": {"$slice": 1}},
             )
         else:
             log_data = None
@@ -457,6 +513,12 @@ class Thread:
             log_url = None
 
         embed = discord.Embed(description=desc, color=self.bot.error_color)
+        if isinstance(log_data, dict) and log_data.get("separate_messages"):
+            embed.add_field(
+                name="Incomplete log",
+                value="This log is too large to be stored in one document, "
+                "the log viewer won't show all of its messages.",
+            )
 
         if self.recipient is not None:
             user = f"{self.recipient} (`{self.id}`)"
@@ -478,15 +540,17 @@ class Thread:
         tasks = [self.bot.config.update()]
 
         if self.bot.log_channel is not None and self.channel is not None:
-            tasks.append(self.bot.log_channel.send(embed=embed))
+            self.manager.count_request("close", "log_message")
+            tasks.append(
+                self.bot.outbound.submit(
+                    self.bot.log_channel.send(embed=embed), Lane.LOGGING
+                )
+            )
 
         # Thread closed message
 
-        embed = discord.Embed(
-            title=self.bot.config["thread_close_title"],
-            color=self.bot.error_color,
-        )
-        if self.bot.config["show_timestamp"]:
+        embed = self.bot.embed_templates.get("close_notice")
+        if self.bot.embed_templates.show_timestamp:
             embed.timestamp = datetime.utcnow()
 
         if not message:
@@ -503,13 +567,18 @@ class Thread:
         )
 
         embed.description = message
-        footer = self.bot.config["thread_close_footer"]
-        embed.set_footer(text=footer, icon_url=self.bot.guild.icon_url)
 
         if not silent and self.recipient is not None:
-            tasks.append(self.recipient.send(embed=embed))
+            self.manager.count_request("close", "recipient_message")
+            tasks.append(
+                self.bot.outbound.submit(
+                    self.recipient.send(embed=embed), Lane.DELIVERY
+                )
+            )
 
         if delete_channel:
+            self.manager.count_request("close", "delete_channel")
+            # awaited below, so it mustn't wait behind the cosmetic lane
             tasks.append(self.channel.delete())
 
         await asyncio.gather(*tasks)
@@ -525,10 +594,6 @@ class Thread:
             self.auto_close_task.cancel()
             self.auto_close_task = None
 
-        to_update = self.bot.config["closures"].pop(str(self.id), None)
-        if to_update is not None:
-            await self.bot.config.update()
-
     async def _restart_close_timer(self):
         """
         This will create or restart a timer to automatically close this
@@ -572,6 +637,85 @@ class Thread:
             auto_close=True,
         )
 
+    async def relay_typing(self, from_recipient: bool) -> None:
+        """
+        Shows the typing indicator on the other side of the thread,
+        at most once per typing window.
+        """
+        now = time.monotonic()
+        if now - self._typing_relayed[from_recipient] < self.TYPING_WINDOW:
+            return
+        self._typing_relayed[from_recipient] = now
+
+        if from_recipient:
+            destination = self.channel
+        else:
+            if self._blocked_state is None or (
+                now - self._blocked_state[0] >= self.BLOCKED_TTL
+            ):
+                self._blocked_state = now, await self.bot.is_blocked(self.recipient)
+            if self._blocked_state[1]:
+                return
+            destination = self.recipient
+
+        self.bot.outbound.submit(
+            destination.trigger_typing(),
+            Lane.COSMETIC,
+            key=("typing", destination.id),
+            droppable=True,
+        )
+
+    def _link_messages(
+        self, thread_message: discord.Message, dm_message: discord.Message
+    ) -> None:
+        """Records the DM twin of a thread channel message."""
+        self._linked_messages[thread_message.id] = dm_message.id
+        self._linked_dm_messages[dm_message.id] = thread_message.id
+        self.bot.loop.create_task(
+            self._store_message_link(thread_message.id, dm_message.id)
+        )
+
+    async def _store_message_link(self, thread_message_id: int, dm_message_id: int):
+        try:
+            await self.bot.api.create_message_link(
+                thread_message_id, dm_message_id, self.channel.id
+            )
+        except Exception:
+            # the link is still kept in memory for the lifetime of the thread
+            logger.warning("Failed to store message link.", exc_info=True)
+
+    async def _delete_message_links(self) -> None:
+        try:
+            await self.bot.api.delete_message_links(self.channel.id)
+        except Exception:
+            logger.warning("Failed to delete message links.", exc_info=True)
+
+    async def _get_linked_id(
+        self, *, thread_message_id: int = None, dm_message_id: int = None
+    ) -> typing.Optional[int]:
+        if thread_message_id is not None:
+            linked_id = self._linked_messages.get(thread_message_id)
+        else:
+            linked_id = self._linked_dm_messages.get(dm_message_id)
+        if linked_id is not None:
+            return linked_id
+
+        try:
+            link = await self.bot.api.find_message_link(
+                thread_message_id=thread_message_id, dm_message_id=dm_message_id
+            )
+        except Exception:
+            logger.warning("Failed to retrieve message link.", exc_info=True)
+            return None
+        if not isinstance(link, dict):
+            return None
+
+        thread_id = int(link["thread_message_id"])
+        dm_id = int(link["dm_message_id"])
+        self._linked_messages[thread_id] = dm_id
+        self._linked_dm_messages[dm_id] = thread_id
+        return dm_id if thread_message_id is not None else thread_id
+
     async def find_linked_messages(
         self,
         message_id: typing.Optional[int] = None,
@@ -640,6 +784,14 @@ class Thread:
         except ValueError:
             raise ValueError("Malformed thread message.")
 
+        linked_id = await self._get_linked_id(thread_message_id=message1.id)
+        if linked_id is not None:
+            try:
+                return message1, await self.recipient.fetch_message(linked_id)
+            except discord.NotFound:
+                logger.debug("Linked DM message %s no longer exists.", linked_id)
+
+        # Fallback for messages sent before links were recorded
         async for msg in self.recipient.history():
             if either_direction:
                 if msg.id == joint_id:
@@ -667,7 +819,7 @@ class Thread:
         embed1.description = message
 
         tasks = [
-            self.bot.api.edit_message(message1.id, message),
+            self.bot.api.edit_message(message1.id, message, channel_id=self.channel.id),
             message1.edit(embed=embed1),
         ]
         if message2 is not None:
@@ -707,6 +859,16 @@ class Thread:
             compare_id = None
 
         if self.channel is not None:
+            linked_id = await self._get_linked_id(dm_message_id=message.id)
+            if linked_id is not None:
+                try:
+                    return await self.channel.fetch_message(linked_id)
+                except discord.NotFound:
+                    logger.debug(
+                        "Linked thread message %s no longer exists.", linked_id
+                    )
+
+            # Fallback for messages sent before links were recorded
             async for linked_message in self.channel.history():
                 if not linked_message.embeds:
                     continue
@@ -739,7 +901,7 @@ class Thread:
         embed.add_field(name="**Edited, former message:**", value=embed.description)
         embed.description = content
         await asyncio.gather(
-            self.bot.api.edit_message(message.id, content),
+            self.bot.api.edit_message(message.id, content, channel_id=self.channel.id),
             linked_message.edit(embed=embed),
         )
 
@@ -821,6 +983,8 @@ class Thread:
                 anonymous=anonymous,
                 plain=plain,
             )
+            if not plain:
+                self._link_messages(msg, user_msg)
 
             tasks.append(
                 self.bot.api.append_log(
@@ -835,11 +999,14 @@ class Thread:
             if self.close_task is not None:
                 await self.cancel_closure()
                 tasks.append(
-                    self.channel.send(
-                        embed=discord.Embed(
-                            color=self.bot.error_color,
-                            description="Scheduled close has been cancelled.",
-                        )
+                    self.bot.outbound.submit(
+                        self.channel.send(
+                            embed=discord.Embed(
+                                color=self.bot.error_color,
+                                description="Scheduled close has been cancelled.",
+                            )
+                        ),
+                        Lane.LOGGING,
                     )
                 )
 
@@ -861,20 +1028,20 @@ class Thread:
         thread_creation: bool = False,
     ) -> None:
 
-        self.bot.loop.create_task(
-            self._restart_close_timer()
-        )  # Start or restart thread auto close
+        # Start or restart thread auto close, only updates the scheduler
+        await self._restart_close_timer()
 
         if self.close_task is not None:
             # cancel closing if a thread message is sent.
             self.bot.loop.create_task(self.cancel_closure())
-            self.bot.loop.create_task(
+            self.bot.outbound.submit(
                 self.channel.send(
                     embed=discord.Embed(
                         color=self.bot.error_color,
                         description="Scheduled close has been cancelled.",
                     )
-                )
+                ),
+                Lane.LOGGING,
             )
 
         if not self.ready:
@@ -889,8 +1056,26 @@ class Thread:
 
         author = message.author
 
-        embed = discord.Embed(description=message.content)
-        if self.bot.config["show_timestamp"]:
+        templates = self.bot.embed_templates
+        if from_mod:
+            # Anonymous reply sent in thread channel
+            if anonymous and isinstance(destination, discord.TextChannel):
+                embed = templates.get("anonymous_thread_reply")
+            # Normal messages
+            elif not anonymous:
+                embed = templates.get("mod_reply")
+                if templates.mod_tag is None:
+                    embed.set_footer(text=str(message.author.top_role))
+            else:
+                embed = templates.get("anonymous_reply")
+        elif note:
+            embed = templates.get("note")
+        else:
+            embed = templates.get("recipient_message")
+            embed.set_footer(text=f"Message ID: {message.id}")
+
+        embed.description = message.content
+        if templates.show_timestamp:
             embed.timestamp = message.created_at
 
         system_avatar_url = (
@@ -904,15 +1089,9 @@ class Thread:
                 and not isinstance(destination, discord.TextChannel)
             ):
                 # Anonymously sending to the user.
-                tag = self.bot.config["mod_tag"]
-                if tag is None:
-                    tag = str(author.top_role)
-                name = self.bot.config["anon_username"]
+                name, avatar_url = templates.anon_author
                 if name is None:
-                    name = tag
-                avatar_url = self.bot.config["anon_avatar_url"]
-                if avatar_url is None:
-                    avatar_url = self.bot.guild.icon_url
+                    name = str(author.top_role)
                 embed.set_author(
                     name=name,
                     icon_url=avatar_url,
@@ -945,16 +1124,7 @@ class Thread:
             else:
                 attachments.append(attachment)
 
-        image_urls = re.findall(
-            r"http[s]?:\/\/(?:[a-zA-Z]|[0-9]|[$-_@.&+]|[!*(),]|(?:%[0-9a-fA-F][0-9a-fA-F]))+",
-            message.content,
-        )
-
-        image_urls = [
-            (is_image_url(url, convert_size=False), None, False)
-            for url in image_urls
-            if is_image_url(url, convert_size=False)
-        ]
+        image_urls = [(url, None, False) for url in find_image_urls(message.content)]
         images.extend(image_urls)
         images.extend(
             (
@@ -1012,7 +1182,7 @@ class Thread:
                     text=f"Additional Image Upload ({additional_count})"
                 )
                 img_embed.timestamp = message.created_at
-                additional_images.append(destination.send(embed=img_embed))
+                additional_images.append((url, destination.send(embed=img_embed)))
                 additional_count += 1
 
         file_upload_count = 1
@@ -1023,25 +1193,6 @@ class Thread:
             )
             file_upload_count += 1
 
-        if from_mod:
-            embed.colour = self.bot.mod_color
-            # Anonymous reply sent in thread channel
-            if anonymous and isinstance(destination, discord.TextChannel):
-                embed.set_footer(text="Anonymous Reply")
-            # Normal messages
-            elif not anonymous:
-                mod_tag = self.bot.config["mod_tag"]
-                if mod_tag is None:
-                    mod_tag = str(message.author.top_role)
-                embed.set_footer(text=mod_tag)  # Normal messages
-            else:
-                embed.set_footer(text=self.bot.config["anon_tag"])
-        elif note:
-            embed.colour = self.bot.main_color
-        else:
-            embed.set_footer(text=f"Message ID: {message.id}")
-            embed.colour = self.bot.recipient_color
-
         if (from_mod or note) and not thread_creation:
             delete_message = not bool(message.attachments)
             if delete_message and destination == self.channel:
@@ -1078,31 +1229,104 @@ class Thread:
                 else:
                     plain_message = "**"
                 plain_message += f"{embed.author.name}:** {embed.description}"
-                files = []
-                for i in embed.fields:
-                    if "Image" in i.name:
-                        async with self.bot.session.get(
-                            i.field[i.field.find("http") : -1]
-                        ) as resp:
-                            stream = io.BytesIO(await resp.read())
-                            files.append(discord.File(stream))
-
-                msg = await destination.send(plain_message, files=files)
+                files, too_large = await self._fetch_attachments(message.attachments)
+                try:
+                    for attachment in too_large:
+                        plain_message += f"\n{attachment.url}"
+
+                    # the attachments are uploaded, not embedded
+                    uploaded = {a.url for a in message.attachments}
+                    for url, coro in additional_images:
+                        if url in uploaded:
+                            coro.close()
+                    additional_images = [
+                        i for i in additional_images if i[0] not in uploaded
+                    ]
+
+                    msg = await self.bot.outbound.submit(
+                        destination.send(plain_message, files=files), Lane.DELIVERY
+                    )
+                finally:
+                    # spooled to temporary files, closed even if never sent
+                    for file in files:
+                        file.close()
             else:
                 # Plain to mods
                 embed.set_footer(text="[PLAIN] " + embed.footer.text)
-                msg = await destination.send(mentions, embed=embed)
+                msg = await self.bot.outbound.submit(
+                    destination.send(mentions, embed=embed), Lane.DELIVERY
+                )
 
         else:
-            msg = await destination.send(mentions, embed=embed)
+            # counted as in flight, so cosmetic requests wait for it
+            msg = await self.bot.outbound.submit(
+                destination.send(mentions, embed=embed), Lane.DELIVERY
+            )
+
+        if not from_mod and not note and destination == self.channel:
+            self._link_messages(msg, message)
 
         if additional_images:
             self.ready = False
-            await asyncio.gather(*additional_images)
+            await asyncio.gather(
+                *(
+                    self.bot.outbound.submit(coro, Lane.DELIVERY)
+                    for _, coro in additional_images
+                )
+            )
             self.ready = True
 
         return msg
 
+    async def _fetch_attachments(
+        self, attachments: typing.List[discord.Attachment]
+    ) -> typing.Tuple[typing.List[discord.File], typing.List[discord.Attachment]]:
+        """
+        Downloads the attachments concurrently to upload them again.
+
+        Small attachments are read into memory, larger ones are streamed
+        to a temporary file.
+
+        Returns
+        -------
+        Tuple[List[discord.File], List[discord.Attachment]]
+            The files, and the attachments that are too large or
+            failed to download.
+        """
+
+        async def fetch(attachment):
+            spoiler = attachment.is_spoiler()
+            if attachment.size <= self.ATTACHMENT_SPOOL_SIZE:
+                return await attachment.to_file(spoiler=spoiler)
+
+            fp = tempfile.TemporaryFile()
+            try:
+                async with self.bot.session.get(attachment.url) as resp:
+                    resp.raise_for_status()
+                    async for chunk in resp.content.iter_chunked(64 * 1024):
+                        fp.write(chunk)
+                fp.seek(0)
+            except Exception:
+                fp.close()
+                raise
+            return discord.File(fp, filename=attachment.filename, spoiler=spoiler)
+
+        files = []
+        skipped = [a for a in attachments if a.size > self.ATTACHMENT_SIZE_LIMIT]
+        pending = [a for a in attachments if a.size <= self.ATTACHMENT_SIZE_LIMIT]
+        results = await asyncio.gather(
+            *(fetch(a) for a in pending), return_exceptions=True
+        )
+        for attachment, result in zip(pending, results):
+            if isinstance(result, Exception):
+                logger.warning(
+                    "Failed to download attachment %s: %s.", attachment.filename, result
+                )
+                skipped.append(attachment)
+            else:
+                files.append(result)
+        return files, skipped
+
     def get_notifications(self) -> str:
         key = str(self.id)
 
@@ -1118,6 +1342,7 @@ class Thread:
 
     async def set_title(self, title) -> None:
         user_id = match_user_id(self.channel.topic)
+        self.manager.count_request("title", "edit_topic")
         await self.channel.edit(topic=f"Title: {title}\nUser ID: {user_id}")
 
 
@@ -1127,10 +1352,56 @@ class ThreadManager:
     def __init__(self, bot):
         self.bot = bot
         self.cache = {}
+        # Secondary indexes, kept in sync with `cache` and the channel topics
+        self._channel_index = {}  # channel ID -> Thread
+        self._topic_index = {}  # topic user ID -> channel ID
+        self._channel_topics = {}  # channel ID -> topic user ID
+        self._requests = Counter()  # (lifecycle stage, request) -> count
 
     async def populate_cache(self) -> None:
+        """
+        Warms up the cache from the modmail guild channel topics,
+        users missing from the client cache are fetched concurrently.
+        """
+        pending = {}
         for channel in self.bot.modmail_guild.text_channels:
-            await self.find(channel=channel)
+            self.index_channel(channel)
+            user_id = self._channel_topics.get(channel.id)
+            if user_id is not None and user_id not in self.cache:
+                pending.setdefault(user_id, channel)
+
+        recipients = {}
+        for user_id in pending:
+            user = self.bot.get_user(user_id)
+            if user is not None:
+                recipients[user_id] = user
+
+        # keep a handful of requests in flight to stay clear of the rate limits
+        semaphore = asyncio.Semaphore(8)
+
+        async def fetch_recipient(user_id):
+            async with semaphore:
+                try:
+                    recipients[user_id] = await self.bot.fetch_user(user_id)
+                except discord.NotFound:
+                    pass
+                except discord.HTTPException:
+                    logger.warning("Failed to fetch user %s.", user_id, exc_info=True)
+
+        missing = [user_id for user_id in pending if user_id not in recipients]
+        if missing:
+            logger.debug("Fetching %d thread recipient(s).", len(missing))
+            await asyncio.gather(*(fetch_recipient(user_id) for user_id in missing))
+
+        for user_id, channel in pending.items():
+            recipient = recipients.get(user_id)
+            if recipient is None or recipient.bot:
+                continue
+            thread = Thread(self, recipient, channel)
+            self.register(thread)
+            thread.ready = True
+
+        logger.debug("Populated %d thread(s).", len(self.cache))
 
     def __len__(self):
         return len(self.cache)
@@ -1141,6 +1412,62 @@ class ThreadManager:
     def __getitem__(self, item: str) -> Thread:
         return self.cache[item]
 
+    def register(self, thread: Thread) -> None:
+        """Stores a thread in the cache and indexes its channel."""
+        previous = self.cache.get(thread.id)
+        if previous is not None and previous is not thread and previous.channel:
+            if self._channel_index.get(previous.channel.id) is previous:
+                del self._channel_index[previous.channel.id]
+        self.cache[thread.id] = thread
+        if thread.channel is not None:
+            self._channel_index[thread.channel.id] = thread
+
+    def pop(self, recipient_id: int) -> Thread:
+        """Removes a thread from the cache, raises `KeyError` if it's missing."""
+        thread = self.cache.pop(recipient_id)
+        if thread.channel is not None:
+            if self._channel_index.get(thread.channel.id) is thread:
+                del self._channel_index[thread.channel.id]
+        return thread
+
+    @property
+    def request_metrics(self) -> typing.Dict[str, typing.Dict[str, int]]:
+        """The number of REST requests made by each thread lifecycle stage."""
+        metrics = {}
+        for (stage, request), count in self._requests.items():
+            metrics.setdefault(stage, {})[request] = count
+        return metrics
+
+    def count_request(self, stage: str, request: str) -> None:
+        """Records a REST request made by a thread lifecycle stage."""
+        self._requests[stage, request] += 1
+
+    def get_channel_thread(self, channel_id: int) -> typing.Optional[Thread]:
+        """Returns the cached thread that owns the channel, if any."""
+        return self._channel_index.get(channel_id)
+
+    def index_channel(self, channel: discord.TextChannel, user_id: int = None) -> None:
+        """
+        Records the user ID found in a channel topic, `user_id` can be passed
+        when the topic was just edited and the channel isn't updated yet.
+        """
+        if user_id is None:
+            user_id = match_user_id(channel.topic) if channel.topic else -1
+
+        old_id = self._channel_topics.pop(channel.id, None)
+        if old_id is not None and self._topic_index.get(old_id) == channel.id:
+            del self._topic_index[old_id]
+
+        if user_id != -1:
+            self._topic_index[user_id] = channel.id
+            self._channel_topics[channel.id] = user_id
+
+    def unindex_channel(self, channel: discord.TextChannel) -> None:
+        """Forgets the topic user ID of a deleted channel."""
+        old_id = self._channel_topics.pop(channel.id, None)
+        if old_id is not None and self._topic_index.get(old_id) == channel.id:
+            del self._topic_index[old_id]
+
     async def find(
         self,
         *,
@@ -1150,15 +1477,17 @@ class ThreadManager:
     ) -> typing.Optional[Thread]:
         """Finds a thread from cache or from discord channel topics."""
         if recipient is None and channel is not None:
-            thread = await self._find_from_channel(channel)
+            thread = self._channel_index.get(channel.id)
             if thread is None:
-                user_id, thread = next(
-                    ((k, v) for k, v in self.cache.items() if v.channel == channel),
-                    (-1, None),
-                )
-                if thread is not None:
-                    logger.debug("Found thread with tempered ID.")
-                    await channel.edit(topic=f"User ID: {user_id}")
+                return await self._find_from_channel(channel)
+            # a claimed channel keeps its old topic until the update event,
+            # the index already has the new one
+            if self._channel_topics.get(channel.id) is None:
+                logger.debug("Found thread with tempered ID.")
+                # index first, concurrent lookups don't repair it again
+                self.index_channel(channel, thread.id)
+                self.count_request("repair", "edit_topic")
+                await channel.edit(topic=f"User ID: {thread.id}")
             return thread
 
         if recipient:
@@ -1184,14 +1513,13 @@ class ThreadManager:
                     )
                     thread = None
         else:
-            channel = discord.utils.get(
-                self.bot.modmail_guild.text_channels, topic=f"User ID: {recipient_id}"
-            )
+            channel_id = self._topic_index.get(recipient_id)
+            channel = self.bot.get_channel(channel_id) if channel_id else None
             if channel:
                 thread = Thread(self, recipient or recipient_id, channel)
                 if thread.recipient:
                     # only save if data is valid
-                    self.cache[recipient_id] = thread
+                    self.register(thread)
                 thread.ready = True
         return thread
 
@@ -1221,7 +1549,8 @@ class ThreadManager:
         if recipient is None:
             thread = Thread(self, user_id, channel)
         else:
-            self.cache[user_id] = thread = Thread(self, recipient, channel)
+            thread = Thread(self, recipient, channel)
+            self.register(thread)
         thread.ready = True
 
         return thread
@@ -1263,21 +1592,7 @@ class ThreadManager:
 
         thread = Thread(self, recipient)
 
-        self.cache[recipient.id] = thread
-
-        # Schedule thread setup for later
-        cat = self.bot.main_category
-        if category is None and len(cat.channels) >= 49:
-            fallback_id = self.bot.config["fallback_category_id"]
-            if fallback_id:
-                fallback = discord.utils.get(cat.guild.categories, id=int(fallback_id))
-                if fallback and len(fallback.channels) < 49:
-                    category = fallback
-
-            if not category:
-                category = await cat.clone(name="Fallback Modmail")
-                self.bot.config.set("fallback_category_id", str(category.id))
-                await self.bot.config.update()
+        self.register(thread)
 
         if (message or not manual_trigger) and self.bot.config[
             "confirm_thread_creation"
@@ -1320,7 +1635,7 @@ class ThreadManager:
                         color=self.bot.error_color,
                     )
                 )
-                del self.cache[recipient.id]
+                self.pop(recipient.id)
                 return thread
             else:
                 if str(r.emoji) == deny_emoji:
@@ -1334,7 +1649,7 @@ class ThreadManager:
                             title="Cancelled", color=self.bot.error_color
                         )
                     )
-                    del self.cache[recipient.id]
+                    self.pop(recipient.id)
                     return thread
 
         self.bot.loop.create_task(
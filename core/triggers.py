@@ -0,0 +1,203 @@
+import re
+import typing
+from collections import deque
+
+from core.models import getLogger
+
+logger = getLogger(__name__)
+
+
+class KeywordAutomaton:
+    """
+    Aho-Corasick automaton for finding which keywords occur in a text.
+
+    Parameters
+    ----------
+    keywords : List[str]
+        The keywords, their position is their priority.
+    """
+
+    def __init__(self, keywords: typing.List[str]):
+        self._goto = [{}]
+        self._fail = [0]
+        # lowest keyword index ending at each state, following the fail links
+        self._best = [None]
+
+        for index, keyword in enumerate(keywords):
+            state = 0
+            for char in keyword:
+                next_state = self._goto[state].get(char)
+                if next_state is None:
+                    next_state = len(self._goto)
+                    self._goto.append({})
+                    self._fail.append(0)
+                    self._best.append(None)
+                    self._goto[state][char] = next_state
+                state = next_state
+            if self._best[state] is None:
+                self._best[state] = index
+
+        queue = deque(self._goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for char, next_state in self._goto[state].items():
+                queue.append(next_state)
+                fail = self._fail[state]
+                while fail and char not in self._goto[fail]:
+                    fail = self._fail[fail]
+                self._fail[next_state] = self._goto[fail].get(char, 0)
+            self._best[state] = self._min(
+                self._best[state], self._best[self._fail[state]]
+            )
+
+    @staticmethod
+    def _min(a: typing.Optional[int], b: typing.Optional[int]):
+        if a is None:
+            return b
+        if b is None:
+            return a
+        return min(a, b)
+
+    def search(self, text: str) -> typing.Optional[int]:
+        """
+        Finds the keyword with the lowest index that occurs in the text.
+
+        Parameters
+        ----------
+        text : str
+            The text to search.
+
+        Returns
+        -------
+        Optional[int]
+            The index of the keyword, `None` if no keyword occurs.
+        """
+        goto, fail, best = self._goto, self._fail, self._best
+        state = 0
+        found = best[0]
+        for char in text:
+            if found == 0:
+                break
+            while state and char not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(char, 0)
+            if best[state] is not None and (found is None or best[state] < found):
+                found = best[state]
+        return found
+
+
+class TriggerIndex:
+    """
+    Matches messages against all of the auto-triggers at once.
+
+    Plain keywords are searched with a `KeywordAutomaton`, regex triggers
+    are compiled into one alternation with a named group per trigger.
+    As before, the first trigger in order that matches wins. The index is
+    rebuilt when `auto_triggers` is replaced or after `invalidate` is called.
+
+    Parameters
+    ----------
+    bot : Bot
+        The Modmail bot.
+    """
+
+    def __init__(self, bot):
+        self.bot = bot
+        self._valid = False
+        self._source = None
+        self._keywords = []
+        self._automaton = None
+        self._combined = None
+        # (index, pattern) of the valid regex triggers
+        self._patterns = []
+        # indexes of the regex triggers left out of the alternation
+        self._alone = set()
+
+    def invalidate(self) -> None:
+        """Marks the auto-triggers as changed, the index is rebuilt on the next match."""
+        self._valid = False
+
+    def _sync(self) -> None:
+        source = self.bot.auto_triggers
+        if self._valid and source is self._source:
+            return
+
+        self._keywords = list(source)
+        self._automaton = KeywordAutomaton([k.lower() for k in self._keywords])
+
+        self._patterns = []
+        self._alone = set()
+        alternatives = []
+        for index, keyword in enumerate(self._keywords):
+            try:
+                pattern = re.compile(keyword)
+            except re.error:
+                logger.warning("Invalid regex autotrigger %s, skipping.", keyword)
+                continue
+            self._patterns.append((index, pattern))
+
+            # triggers with their own groups may use backreferences, which
+            # would be renumbered in the alternation
+            alternative = f"(?P<t{index}>{keyword})"
+            try:
+                if pattern.groups:
+                    raise re.error("trigger has groups")
+                re.compile(alternative)
+            except re.error:
+                self._alone.add(index)
+            else:
+                alternatives.append(alternative)
+
+        self._combined = re.compile("|".join(alternatives)) if alternatives else None
+        self._source = source
+        self._valid = True
+
+    def match(
+        self, content: str, *, regex: bool = False
+    ) -> typing.Optional[typing.Tuple[str, str]]:
+        """
+        Finds the first auto-trigger matching the content.
+
+        Parameters
+        ----------
+        content : str
+            The message content.
+        regex : bool
+            Whether the triggers are regular expressions.
+
+        Returns
+        -------
+        Optional[Tuple[str, str]]
+            The trigger and the matched text, `None` if nothing matches.
+        """
+        self._sync()
+
+        if not regex:
+            index = self._automaton.search(content.lower())
+            if index is None:
+                return None
+            keyword = self._keywords[index]
+            return keyword, keyword.lower()
+
+        found = None
+        if self._combined is not None:
+            match = self._combined.search(content)
+            if match is not None:
+                found = int(match.lastgroup[1:]), match.group(0)
+
+        # the alternation finds the leftmost match, an earlier trigger
+        # may still match further in the content
+        for index, pattern in self._patterns:
+            if found is not None and index >= found[0]:
+                break
+            if found is None and index not in self._alone:
+                continue
+            match = pattern.search(content)
+            if match is not None:
+                found = index, match.group(0)
+                break
+
+        if found is None:
+            return None
+        index, invoker = found
+        return self._keywords[index], invoker
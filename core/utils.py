@@ -6,18 +6,18 @@ import typing
 from difflib import get_close_matches
 from distutils.util import strtobool as _stb  # pylint: disable=import-error
 from itertools import takewhile, zip_longest
-from urllib import parse
 
 import discord
 from discord.ext import commands
 
+from core.links import image_url
+
 __all__ = [
     "strtobool",
     "User",
     "truncate",
     "format_preview",
     "is_image_url",
-    "parse_image_url",
     "human_join",
     "days",
     "cleanup_code",
@@ -133,40 +133,7 @@ def is_image_url(url: str, **kwargs) -> str:
     bool
         Whether the URL is a valid image URL.
     """
-    if url.startswith("https://gyazo.com") or url.startswith("http://gyazo.com"):
-        # gyazo support
-        url = re.sub(
-            r"(http[s]?:\/\/)((?:[a-zA-Z]|[0-9]|[$-_@.&+]|[!*(),]|(?:%[0-9a-fA-F][0-9a-fA-F]))+)",
-            r"\1i.\2.png",
-            url,
-        )
-
-    return parse_image_url(url, **kwargs)
-
-
-def parse_image_url(url: str, *, convert_size=True) -> str:
-    """
-    Convert the image URL into a sized Discord avatar.
-
-    Parameters
-    ----------
-    url : str
-        The URL to convert.
-
-    Returns
-    -------
-    str
-        The converted URL, or '' if the URL isn't in the proper format.
-    """
-    types = [".png", ".jpg", ".gif", ".jpeg", ".webp"]
-    url = parse.urlsplit(url)
-
-    if any(url.path.lower().endswith(i) for i in types):
-        if convert_size:
-            return parse.urlunsplit((*url[:3], "size=128", url[-1]))
-        else:
-            return parse.urlunsplit(url)
-    return ""
+    return image_url(url, **kwargs)
 
 
 def human_join(strings):
@@ -345,8 +312,6 @@ def escape_code_block(text):
 
 def format_channel_name(bot, author, exclude_channel=None, force_null=False):
     """Sanitises a username for use with text channel names"""
-    guild = bot.modmail_guild
-
     if force_null:
         name = new_name = "null"
     else:
@@ -365,8 +330,7 @@ def format_channel_name(bot, author, exclude_channel=None, force_null=False):
             ) + f"-{author.discriminator}"
 
     counter = 1
-    existed = set(c.name for c in guild.text_channels if c != exclude_channel)
-    while new_name in existed:
+    while bot.category_pool.is_name_taken(new_name, exclude_channel):
         new_name = f"{name}_{counter}"  # multiple channels with same name
         counter += 1
 
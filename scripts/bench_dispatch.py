@@ -0,0 +1,157 @@
+"""
+Measures the per-message overhead of resolving the prefix, the invoked
+command and the thread of a message, as `process_commands` did before and
+after the dispatch was resolved once per message.
+
+Only the dispatch itself is measured: the thread lookup is a dictionary
+lookup here, so the real saving is larger when the thread has to be found
+from the channel topic or the API.
+
+Usage: python scripts/bench_dispatch.py [iterations]
+"""
+
+import asyncio
+import os
+import sys
+import time
+from types import SimpleNamespace
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import discord  # noqa: E402
+from discord.ext import commands  # noqa: E402
+from discord.ext.commands.view import StringView  # noqa: E402
+
+from bot import ModmailBot  # noqa: E402
+from core.dispatch import DispatchTable  # noqa: E402
+from core.utils import normalize_alias  # noqa: E402
+
+CORPUS = [
+    "Thanks, I'll take a look at it now.",
+    "?reply Hi, could you send us a screenshot of the error?",
+    "?areply We've passed this on to the team.",
+    "?close in 2h",
+    "?note Asked for the order number",
+    "?ty",
+    "Can someone else take this one?",
+    "?logs",
+    "?ticketinfo some extra arguments",
+    "<@1234> please check this thread",
+]
+COMMANDS = ["reply", "areply", "close", "note", "logs", "freply", "fareply"]
+ALIASES = {"ty": "reply Thank you for contacting us!", "ticketinfo": "logs"}
+
+
+class FakeThreads:
+    def __init__(self, threads):
+        self.threads = threads
+        self.lookups = 0
+
+    async def find(self, *, channel):
+        self.lookups += 1
+        return self.threads.get(channel.id)
+
+
+class BenchBot:
+    resolve_message = ModmailBot.resolve_message
+    get_contexts = ModmailBot.get_contexts
+    get_prefix = ModmailBot.get_prefix
+    _alias_contexts = ModmailBot._alias_contexts
+
+    def __init__(self):
+        self.prefix = "?"
+        self.user = SimpleNamespace(id=1234)
+        self._prefixes = None
+        self._skip_check = lambda x, y: x == y
+        self.aliases = dict(ALIASES)
+        self.snippets = {}
+        self.dispatch_table = DispatchTable(self)
+        self.all_commands = {name: object() for name in COMMANDS}
+        self.threads = FakeThreads({10: object()})
+
+    async def get_prefix_before(self):
+        return [self.prefix, f"<@{self.user.id}> ", f"<@!{self.user.id}> "]
+
+    async def get_contexts_before(self, message, *, cls=commands.Context):
+        view = StringView(message.content)
+        ctx = cls(prefix=self.prefix, view=view, bot=self, message=message)
+        thread = await self.threads.find(channel=ctx.channel)
+
+        if self._skip_check(message.author.id, self.user.id):
+            return [ctx]
+
+        prefixes = await self.get_prefix_before()
+
+        invoked_prefix = discord.utils.find(view.skip_string, prefixes)
+        if invoked_prefix is None:
+            return [ctx]
+
+        invoker = view.get_word().lower()
+
+        alias = self.aliases.get(invoker)
+        if alias is not None:
+            ctxs = []
+            aliases = normalize_alias(
+                alias, message.content[len(f"{invoked_prefix}{invoker}") :]
+            )
+            for alias in aliases:
+                view = StringView(invoked_prefix + alias)
+                ctx_ = cls(prefix=self.prefix, view=view, bot=self, message=message)
+                ctx_.thread = thread
+                discord.utils.find(view.skip_string, prefixes)
+                ctx_.invoked_with = view.get_word().lower()
+                ctx_.command = self.all_commands.get(ctx_.invoked_with)
+                ctxs += [ctx_]
+            return ctxs
+
+        ctx.thread = thread
+        ctx.invoked_with = invoker
+        ctx.command = self.all_commands.get(invoker)
+        return [ctx]
+
+    async def before(self, message):
+        for ctx in await self.get_contexts_before(message):
+            if not ctx.command:
+                await self.threads.find(channel=ctx.channel)
+
+    async def after(self, message):
+        resolved = await self.resolve_message(message)
+        # the reply path reads `resolved.thread`, without another lookup
+        await self.get_contexts(message, resolved=resolved)
+
+
+def make_message(content):
+    return SimpleNamespace(
+        content=content,
+        author=SimpleNamespace(id=42),
+        channel=SimpleNamespace(id=10),
+        guild=None,
+        _state=None,
+    )
+
+
+async def measure(handler, iterations):
+    messages = [make_message(content) for content in CORPUS]
+    for message in messages:  # warm up
+        await handler(message)
+
+    start = time.perf_counter()
+    for _ in range(iterations):
+        for message in messages:
+            await handler(message)
+    return (time.perf_counter() - start) / (iterations * len(messages))
+
+
+async def main(iterations):
+    for name in ("before", "after"):
+        bot = BenchBot()
+        per_message = await measure(getattr(bot, name), iterations)
+        lookups = bot.threads.lookups / ((iterations + 1) * len(CORPUS))
+        print(
+            f"{name:>6}: {per_message * 1e6:6.2f} us/message, "
+            f"{lookups:.2f} thread lookups/message"
+        )
+
+
+if __name__ == "__main__":
+    asyncio.run(main(int(sys.argv[1]) if len(sys.argv) > 1 else 20000))
@@ -0,0 +1,96 @@
+"""
+Measures finding the image URLs of thread messages, with the regex and
+URL parsing done per message as before `core.links`, and with the
+precompiled patterns and the cached URL classification of `core.links`.
+
+The corpus mimics a modmail channel: most messages are plain text, some
+link screenshots, Discord attachments or pages, and links are repeated
+across messages as they are in a conversation.
+
+Usage: python scripts/bench_links.py [iterations]
+"""
+
+import os
+import random
+import re
+import sys
+import timeit
+from urllib import parse
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from core.links import find_image_urls  # noqa: E402
+
+WORDS = (
+    "hi hello thanks please I can't log in to my account since yesterday the "
+    "server says my order was refunded but never arrived could you check it "
+    "again when you have time sorry for the wait any update on this"
+).split()
+LINKS = [
+    "https://i.imgur.com/{}.png",
+    "https://gyazo.com/{}",
+    "https://cdn.discordapp.com/attachments/{}/image.PNG",
+    "https://media.discordapp.net/attachments/{}/clip.webp?width=400",
+    "https://github.com/example/project/issues/{}",
+    "https://example.com/help/article?id={}",
+    "http://discord.gg/{}",
+]
+
+
+def old_is_image_url(url, *, convert_size=True):
+    if url.startswith("https://gyazo.com") or url.startswith("http://gyazo.com"):
+        url = re.sub(
+            r"(http[s]?:\/\/)((?:[a-zA-Z]|[0-9]|[$-_@.&+]|[!*(),]|(?:%[0-9a-fA-F][0-9a-fA-F]))+)",
+            r"\1i.\2.png",
+            url,
+        )
+
+    types = [".png", ".jpg", ".gif", ".jpeg", ".webp"]
+    url = parse.urlsplit(url)
+    if any(url.path.lower().endswith(i) for i in types):
+        if convert_size:
+            return parse.urlunsplit((*url[:3], "size=128", url[-1]))
+        return parse.urlunsplit(url)
+    return ""
+
+
+def old_find_image_urls(content):
+    image_urls = re.findall(
+        r"http[s]?:\/\/(?:[a-zA-Z]|[0-9]|[$-_@.&+]|[!*(),]|(?:%[0-9a-fA-F][0-9a-fA-F]))+",
+        content,
+    )
+    return [
+        old_is_image_url(url, convert_size=False)
+        for url in image_urls
+        if old_is_image_url(url, convert_size=False)
+    ]
+
+
+def make_corpus(size, seed=0):
+    rng = random.Random(seed)
+    # a conversation keeps linking the same few things
+    links = [rng.choice(LINKS).format(rng.randrange(10 ** 6)) for _ in range(40)]
+    corpus = []
+    for _ in range(size):
+        words = rng.choices(WORDS, k=rng.randint(1, 40))
+        for _ in range(rng.choices((0, 1, 2, 3), weights=(70, 20, 7, 3))[0]):
+            words.insert(rng.randrange(len(words) + 1), rng.choice(links))
+        corpus.append(" ".join(words))
+    return corpus
+
+
+def main(iterations):
+    corpus = make_corpus(1000)
+    for content in corpus:
+        assert old_find_image_urls(content) == find_image_urls(content), content
+
+    for name, func in (("before", old_find_image_urls), ("after", find_image_urls)):
+        seconds = timeit.timeit(
+            lambda: [func(content) for content in corpus], number=iterations
+        )
+        per_message = seconds / (iterations * len(corpus))
+        print(f"{name:>6}: {per_message * 1e6:6.2f} us/message")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 20)